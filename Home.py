@@ -1,13 +1,26 @@
 import streamlit as st
-from st_bridge import bridge, html
-import streamlit.components.v1 as components
-from utils.helpers import load_style, load_landing_page, load_footer
+from st_bridge import html
+from utils import metrics, watcher
+from utils.helpers import load_page_chunks, warm_up
+from utils.tenants import resolve_tenant
 
 st.set_page_config(layout="wide", page_icon="./static/logo.png")
 
+# Keep the caches in sync with template/ and rerun this session when its page changes
+watcher.start()
 
-html(f"""
-{load_landing_page()}
-{load_footer()}
-{load_style()}
-""")
\ No newline at end of file
+# Parse configs and build every page once per process, before the first render
+warm_up()
+
+# Serve the site matching ?site= or the Host header, if it has a tenant directory
+tenant = resolve_tenant(st.query_params, st.context.headers)
+
+# Each chunk is shown as soon as it is sent; with progressive rendering the sections
+# below the fold are rendered while the browser paints the navbar and hero
+sent = []
+with metrics.stage('bridge', 'home') as timer:
+    for chunk in load_page_chunks(tenant):
+        html(chunk)
+        sent.append(chunk)
+    timer.nbytes = sum(len(chunk) for chunk in sent)
+watcher.track_session(''.join(sent), tenant)
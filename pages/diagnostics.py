@@ -0,0 +1,71 @@
+import streamlit as st
+from utils import metrics
+from utils.helpers import cache_stats, payload_stats
+from utils.watcher import watcher_stats
+
+# The page is reachable by URL even though the sidebar hides it, so it only
+# exists when instrumentation is switched on or in Streamlit's development mode
+if not (metrics.enabled() or st.get_option("global.developmentMode")):
+    st.error("Page not found.")
+    st.stop()
+
+st.title("Diagnostics")
+
+# Per-stage timings of page builds
+st.subheader("Stage Timings")
+rows = metrics.recorder.snapshot()
+if rows:
+    st.dataframe(rows, use_container_width=True)
+else:
+    st.write("No samples recorded yet.")
+
+# Cache hit rates
+st.subheader("Caches")
+stats = cache_stats()
+st.dataframe(
+    [
+        {
+            "cache": name,
+            "hits": s["hits"],
+            "misses": s["misses"],
+            "hit_rate": s["hits"] / (s["hits"] + s["misses"]) if s["hits"] + s["misses"] else None,
+            "size": s["size"],
+        }
+        for name, s in stats.items()
+    ],
+    use_container_width=True,
+)
+
+# File watcher
+st.subheader("File Watcher")
+watcher = watcher_stats()
+if watcher["backend"]:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Backend", watcher["backend"])
+    col2.metric("File changes handled", watcher["changes"])
+    col3.metric("Tracked sessions", watcher["sessions"])
+else:
+    st.write("The watcher starts with the first visit to the home page.")
+
+# Payload size
+st.subheader("Payload")
+payload = payload_stats()
+if payload:
+    col1, col2 = st.columns(2)
+    col1.metric("Before optimization", f"{payload['before']:,} bytes")
+    col2.metric("After optimization", f"{payload['after']:,} bytes",
+                delta=f"{payload['after'] - payload['before']:,} bytes", delta_color="inverse")
+else:
+    st.write("No payload optimized yet.")
+
+# Prometheus export
+st.subheader("Export")
+# The target is fixed by LANDING_METRICS_FILE on the server, not chosen on the page
+export_path = metrics.export_path()
+st.caption(f"Prometheus text file: `{export_path}` (set LANDING_METRICS_FILE to change)")
+if st.button("Export Metrics"):
+    metrics.export_prometheus(export_path, stats)
+    st.success(f"Metrics written to {export_path}")
+
+with st.expander("Prometheus text"):
+    st.code(metrics.prometheus_text(stats), language="text")
@@ -0,0 +1,108 @@
+import pytest
+
+from utils.config_store import ConfigStore, thaw
+from utils.models import ConfigError, load_model
+
+_AUTH = '''footer:
+  logo:
+    src: logo.png
+    alt: Logo
+  social_links:
+  - name: GitHub
+    url: https://github.com
+    icon: bi-github
+'''
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / 'auth.yaml').write_text(_AUTH, encoding='utf-8')
+    return ConfigStore(str(tmp_path))
+
+
+def _replace(store, name, text):
+    """Rewrite a config file and make the store re-read it"""
+    with open(store.path(name), 'w', encoding='utf-8') as f:
+        f.write(text)
+    store.invalidate(name)
+
+
+def test_valid_file(store):
+    model, digest = store.load('auth')
+    assert model.footer.logo.alt == 'Logo'
+    assert store.error('auth') is None
+    assert store.get('auth')['footer']['logo']['src'] == 'logo.png'
+
+
+def test_missing_file(store):
+    assert store.load('landing') == (None, store.digest('landing'))
+    assert store.get('landing') == {}
+    assert store.error('landing') is None
+
+
+def test_syntax_error_keeps_last_valid_model(store):
+    good = store.load('auth')
+    _replace(store, 'auth', _AUTH + 'broken: [\n')
+    assert 'invalid YAML' in str(store.error('auth'))
+    assert store.get('auth') == {}
+    assert store.load('auth') == good
+
+
+def test_model_error_keeps_data_and_last_valid_model(store):
+    good = store.load('auth')
+    _replace(store, 'auth', _AUTH.replace('    src: logo.png\n', ''))
+    assert str(store.error('auth')) == 'auth.yaml: footer.logo.src: missing'
+    # The editor still gets the data to fix
+    assert store.get('auth')['footer']['logo'] == {'alt': 'Logo'}
+    assert store.load('auth') == good
+
+
+def test_non_mapping_root(store):
+    good = store.load('auth')
+    _replace(store, 'auth', '- a\n- b\n')
+    assert 'expected a mapping' in str(store.error('auth'))
+    assert store.get('auth') == {}
+    assert store.load('auth') == good
+
+
+def test_invalid_file_without_valid_model_raises(tmp_path):
+    (tmp_path / 'auth.yaml').write_text('footer: [\n', encoding='utf-8')
+    store = ConfigStore(str(tmp_path))
+    with pytest.raises(ConfigError):
+        store.load('auth')
+    assert store.get('auth') == {}
+
+
+def test_fixed_file_is_used_again(store):
+    _replace(store, 'auth', 'footer: [\n')
+    _replace(store, 'auth', _AUTH.replace('Logo', 'New logo'))
+    assert store.error('auth') is None
+    assert store.load('auth')[0].footer.logo.alt == 'New logo'
+
+
+def test_write_over_invalid_file(store):
+    data = thaw(store.get('auth'))
+    _replace(store, 'auth', 'footer: [\n')
+    assert store.write('auth', data)
+    assert store.error('auth') is None
+
+
+def test_write_rejects_invalid_data(store):
+    with pytest.raises(ConfigError):
+        store.write('auth', {'footer': {}})
+
+
+def test_blank_and_unknown_keys():
+    model = load_model('auth', {'footer': {'logo': {'src': 'a.png', 'alt': None}, 'tagline': 'x'}, 'login': {}})
+    assert model.footer.logo.alt == ''
+    assert model.footer.social_links == ()
+
+
+def test_scalars_are_read_as_text():
+    model = load_model('auth', {'footer': {'logo': {'src': 1, 'alt': True}, 'social_links': [
+        {'name': 2.5, 'url': 'u', 'icon': False},
+    ]}})
+    assert model.footer.logo.src == '1'
+    assert model.footer.logo.alt == 'True'
+    assert model.footer.social_links[0].name == '2.5'
+    assert model.footer.social_links[0].icon == 'False'
@@ -0,0 +1,113 @@
+import pytest
+
+from utils.item_list import ItemList
+
+
+def _check_links(items):
+    """Assert that the forward and backward chains agree with the values"""
+    forward = [item_id for item_id, _ in items]
+    backward = []
+    item_id = items.tail
+    while item_id is not None:
+        backward.append(item_id)
+        item_id = items._prev[item_id]
+    assert forward == backward[::-1]
+    assert len(forward) == len(items)
+    assert items.head == (forward[0] if forward else None)
+
+
+def test_keeps_insertion_order():
+    items = ItemList(['a', 'b', 'c'])
+    assert items.values() == ['a', 'b', 'c']
+    assert len(items) == 3
+    _check_links(items)
+
+
+def test_empty_list():
+    items = ItemList()
+    assert items.values() == []
+    assert items.head is None and items.tail is None
+    assert items.page(0, 10) == []
+
+
+def test_ids_are_stable_and_never_reused():
+    items = ItemList(['a', 'b'])
+    a, b = [item_id for item_id, _ in items]
+    items.remove(a)
+    c = items.append('c')
+    assert c not in (a, b)
+    assert a not in items
+    assert items[b] == 'b' and items[c] == 'c'
+
+
+def test_insert_after():
+    items = ItemList(['a', 'c'])
+    a, c = [item_id for item_id, _ in items]
+    items.insert_after(a, 'b')
+    items.insert_after(None, 'start')
+    items.insert_after(c, 'end')
+    assert items.values() == ['start', 'a', 'b', 'c', 'end']
+    _check_links(items)
+
+
+def test_remove_head_middle_and_tail():
+    items = ItemList(['a', 'b', 'c', 'd'])
+    a, b, c, d = [item_id for item_id, _ in items]
+    assert items.remove(b) == 'b'
+    assert items.remove(a) == 'a'
+    assert items.remove(d) == 'd'
+    assert items.values() == ['c']
+    assert items.head == items.tail == c
+    items.remove(c)
+    assert items.values() == []
+    assert items.head is None and items.tail is None
+
+
+def test_move_up_and_down():
+    items = ItemList(['a', 'b', 'c'])
+    a, b, c = [item_id for item_id, _ in items]
+    items.move_up(c)
+    assert items.values() == ['a', 'c', 'b']
+    items.move_up(c)
+    assert items.values() == ['c', 'a', 'b']
+    # Moving the first item up or the last item down changes nothing
+    items.move_up(c)
+    items.move_down(b)
+    assert items.values() == ['c', 'a', 'b']
+    items.move_down(c)
+    assert items.values() == ['a', 'c', 'b']
+    _check_links(items)
+
+
+def test_move_after():
+    items = ItemList(['a', 'b', 'c'])
+    a, b, c = [item_id for item_id, _ in items]
+    items.move_after(a, c)
+    assert items.values() == ['b', 'c', 'a']
+    items.move_after(a, None)
+    assert items.values() == ['a', 'b', 'c']
+    items.move_after(b, b)
+    assert items.values() == ['a', 'b', 'c']
+    _check_links(items)
+
+
+def test_setitem_updates_in_place():
+    items = ItemList([{'q': 1}])
+    (item_id, _), = items
+    items[item_id] = {'q': 2}
+    assert items.values() == [{'q': 2}]
+    with pytest.raises(KeyError):
+        items[item_id + 1] = {}
+
+
+def test_page():
+    items = ItemList(range(25))
+    assert [value for _, value in items.page(0, 10)] == list(range(10))
+    assert [value for _, value in items.page(20, 10)] == list(range(20, 25))
+    assert items.page(30, 10) == []
+
+
+def test_values_returns_a_copy():
+    items = ItemList(['a'])
+    items.values().append('b')
+    assert items.values() == ['a']
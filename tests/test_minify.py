@@ -0,0 +1,130 @@
+from utils.minify import extract_styles, minify_css, minify_html, optimize_page, prune_css
+
+_MARKUP = '''
+<nav class="navbar" id="header">
+  <a class="nav-link" href="#hero">Home</a>
+  <button onclick="document.getElementById('navbarNav').classList.toggle('show', 'expanded')">Menu</button>
+  <ul><li>One</li><li>Two</li></ul>
+  <input type="email">
+</nav>
+'''
+
+
+def _kept(css, selector):
+    """Return whether a rule with the given selector survives pruning against _MARKUP"""
+    return f'{selector}{{' in prune_css(css, _MARKUP)
+
+
+def test_prune_drops_unused_rules():
+    css = '.navbar { color: red; } .unused { color: blue; } #missing { margin: 0 } table { border: 0 }'
+    assert prune_css(css, _MARKUP) == '.navbar{color:red}'
+
+
+def test_prune_keeps_pseudo_classes_and_elements():
+    for selector in ('a:hover', '.nav-link:focus-visible', 'li:first-child', 'li:nth-child(2n+1)',
+                     '.navbar::before', 'li::marker', ':root', '*'):
+        assert _kept(f'{selector}{{color:red}}', selector), selector
+
+
+def test_prune_keeps_attribute_selectors():
+    for selector in ('input[type="email"]', 'a[href^="#"]', '[data-theme=dark] .navbar', 'input[type=email]'):
+        assert _kept(f'{selector}{{color:red}}', selector), selector
+
+
+def test_prune_keeps_negations_and_functional_pseudo_classes():
+    for selector in ('.nav-link:not(.disabled-link)', 'li:not(:last-child)', ':is(.navbar,.missing) a',
+                     '.navbar:has(.unknown)', ':where(.absent)'):
+        assert _kept(f'{selector}{{color:red}}', selector), selector
+
+
+def test_prune_keeps_state_classes_added_at_runtime():
+    # Scroll handlers and Bootstrap add these classes after the fragment is rendered
+    for selector in ('.navbar.scrolled', '.nav-link.active', '.navbar .show'):
+        assert _kept(f'{selector}{{color:red}}', selector), selector
+
+
+def test_prune_keeps_every_class_of_inline_classlist_calls():
+    css = '.expanded{color:red}'
+    assert prune_css(css, _MARKUP) == css
+
+
+def test_prune_keeps_escaped_selectors():
+    css = '.md\\:flex{display:flex}'
+    assert prune_css(css, '<div class="md:flex"></div>') == css
+
+
+def test_prune_filters_selector_lists():
+    css = '.navbar,.unused,a{color:red}'
+    assert prune_css(css, _MARKUP) == '.navbar,a{color:red}'
+
+
+def test_prune_recurses_into_media_and_supports():
+    css = ('@media (min-width: 768px){@supports (display:grid){.navbar{display:grid}.unused{color:red}}}'
+           '@media print{.unused{display:none}}')
+    assert prune_css(css, _MARKUP) == '@media (min-width:768px){@supports (display:grid){.navbar{display:grid}}}'
+
+
+def test_prune_keeps_other_at_rules():
+    css = ('@import url(fonts.css);@font-face{font-family:x;src:url(x.woff2)}'
+           '@keyframes fade{from{opacity:0}to{opacity:1}}')
+    assert prune_css(css, _MARKUP) == css
+
+
+def test_prune_ignores_braces_in_strings():
+    css = '.navbar::after{content:"}{ .unused {"}.unused{color:red}'
+    assert prune_css(css, _MARKUP) == '.navbar::after{content:"}{ .unused {"}'
+
+
+def test_minify_css_keeps_quoted_strings():
+    css = '.a::before { content: "a ,  b ; c > d"; } .b::after { content: \'x:  y\' }'
+    assert minify_css(css) == '.a::before{content:"a ,  b ; c > d"}.b::after{content:\'x:  y\'}'
+
+
+def test_minify_css_keeps_url_values():
+    css = ('.a { background: url( "a b.png" ) }'
+           ' .b { background: url(data:image/svg+xml;utf8,<svg> <path d="M0 0"/> </svg>) }')
+    assert minify_css(css) == (
+        '.a{background:url( "a b.png" )}'
+        '.b{background:url(data:image/svg+xml;utf8,<svg> <path d="M0 0"/> </svg>)}'
+    )
+
+
+def test_minify_css_keeps_descendant_pseudo_classes():
+    # ".nav :first-child" selects descendants; ".nav:first-child" would not
+    assert minify_css('.nav  :first-child > a { color : red ; }') == '.nav :first-child>a{color :red}'
+
+
+def test_minify_css_strips_comments():
+    assert minify_css('/* header */\n.a {\n  color: red; /* note */\n}\n') == '.a{color:red}'
+
+
+def test_minify_html_keeps_inline_styles_minified():
+    html = '<div class="a">\n  <p>Hello   world</p>\n</div>\n<style>\n.a { color: red; }\n</style>'
+    assert minify_html(html) == '<div class="a"><p>Hello world</p></div><style>.a{color:red}</style>'
+
+
+def test_optimize_page_prunes_against_the_whole_page():
+    html = f'{_MARKUP}<style>.navbar{{color:red}}.unused{{color:blue}}</style>'
+    optimized, stats = optimize_page(html)
+    assert '<style>.navbar{color:red}</style>' in optimized
+    assert stats['after'] < stats['before']
+
+
+def test_optimize_page_without_pruning_keeps_all_rules():
+    html = f'{_MARKUP}<style>.unused{{color:blue}}</style>'
+    optimized, _ = optimize_page(html, prune=False)
+    assert '.unused{color:blue}' in optimized
+
+
+def test_extract_styles_moves_imports_to_the_top():
+    html = ('<style>.a{color:red}</style><p>x</p>'
+            '<style>/* @import url(ignored.css); */@charset "utf-8";'
+            '@import url(\'https://fonts.example/css?family=A:wght@300;400\');.b{color:blue}</style>')
+    markup, css = extract_styles(html)
+    assert markup == '<p>x</p>'
+    assert css.split('\n') == [
+        '@charset "utf-8";',
+        "@import url('https://fonts.example/css?family=A:wght@300;400');",
+        '.a{color:red}',
+        '.b{color:blue}',
+    ]
@@ -0,0 +1,149 @@
+"""Benchmark the page render pipeline in utils/helpers.py
+
+Usage:
+    python tools/benchmark.py [--output bench.json] [--repeat 20] [--scales 10 100 1000]
+
+Times load_config, _load_html_file, load_landing_page, load_footer and
+load_style cold (all in-process caches cleared before each call) and warm
+(caches populated), in template mode and static HTML mode. In template
+mode the landing config is also scaled to N feature items, FAQ items and
+pricing plans. Results are written as JSON so runs can be compared
+between commits.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Make the project root importable when run via `python tools/benchmark.py`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
+
+import yaml
+
+from utils import helpers
+from utils.config_store import read_config, thaw
+
+# Functions timed in each mode, as (name, callable)
+_TARGETS = [
+    ('load_config', lambda: helpers.load_config('landing')),
+    ('_load_html_file', lambda: helpers._load_html_file('landing', 'landing')),
+    ('load_landing_page', helpers.load_landing_page),
+    ('load_footer', helpers.load_footer),
+    ('load_style', helpers.load_style),
+]
+
+
+def _time_call(func, repeat, cold):
+    """Return the median and p95 time of func in milliseconds, and the size of its result"""
+    samples = []
+    result = func()
+    for _ in range(repeat):
+        if cold:
+            helpers.clear_caches()
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    size = len(result.encode('utf-8')) if isinstance(result, str) else None
+    return {
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'bytes': size,
+    }
+
+
+def _scaled_config(config, count):
+    """Return a copy of the landing config with count feature items, FAQ items and pricing plans"""
+    config = thaw(config)
+    landing = config['landing']
+    for section, key in (('feature', 'list_item'), ('faq', 'faq_items'), ('pricing', 'plans')):
+        items = landing[section][key]
+        landing[section][key] = [dict(items[i % len(items)]) for i in range(count)]
+    return config
+
+
+def _run_mode(use_template, repeat, scale=None):
+    """Time every target in one mode and config scale"""
+    helpers.set_template_mode(use_template)
+    results = []
+    for name, func in _TARGETS:
+        for cold in (True, False):
+            result = _time_call(func, repeat, cold)
+            result.update({
+                'mode': 'template' if use_template else 'static',
+                'scale': scale,
+                'function': name,
+                'cache': 'cold' if cold else 'warm',
+            })
+            results.append(result)
+    return results
+
+
+def run(repeat=20, scales=(10, 100, 1000)):
+    """Run the full benchmark from the project root and return the results"""
+    results = _run_mode(True, repeat) + _run_mode(False, repeat)
+
+    # Scaled configs are rendered from a scratch copy of the template directory
+    base_config = read_config('landing')
+    with tempfile.TemporaryDirectory() as scratch:
+        shutil.copytree(helpers._TEMPLATE_DIR, os.path.join(scratch, helpers._TEMPLATE_DIR))
+        config_path = os.path.join(scratch, 'template', 'config', 'landing.yaml')
+        cwd = os.getcwd()
+        os.chdir(scratch)
+        try:
+            for count in scales:
+                with open(config_path, 'w', encoding='utf-8') as f:
+                    yaml.dump(_scaled_config(base_config, count), f, allow_unicode=True, sort_keys=False)
+                results += _run_mode(True, repeat, scale=count)
+        finally:
+            os.chdir(cwd)
+            helpers.set_template_mode(True)
+
+    return results
+
+
+def _git_revision():
+    """Return the current commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the landing page render pipeline')
+    parser.add_argument('--output', default='bench.json', help='JSON file to write the results to')
+    parser.add_argument('--repeat', type=int, default=20, help='timed calls per measurement')
+    parser.add_argument('--scales', type=int, nargs='*', default=[10, 100, 1000],
+                        help='item counts for the synthetic landing configs')
+    args = parser.parse_args()
+
+    os.chdir(_ROOT)
+    results = run(repeat=args.repeat, scales=args.scales)
+    report = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        scale = r['scale'] if r['scale'] is not None else '-'
+        print(f"{r['mode']:8} {scale!s:>5} {r['function']:18} {r['cache']:4} {r['median_ms']:8.3f} ms")
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,759 +1,753 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import yaml
+import difflib
 import os
-from typing import Dict, Any
+import sys
+import time
+from typing import Dict, Any, Callable, List, Optional, Sequence
+
+# Make the project root importable when run via `streamlit run tools/config_editor.py`
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config_store import config_store, read_config, thaw, write_config
+from utils.models import ConfigError
+from utils.helpers import config_digest, image_size, invalidate_config, render_preview
+from utils.item_list import ItemList
 
 # Set page title and layout
 st.set_page_config(page_title="Website Configuration Editor", layout="wide")
 
 def load_config() -> Dict[str, Any]:
     """Load configuration file"""
-    try:
-        with open("template/config/landing.yaml", "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        # If file doesn't exist, return empty dictionary
-        return {}
-
-def save_config(config: Dict[str, Any]) -> None:
-    """Save configuration file"""
-    # Ensure directory exists
-    os.makedirs("template/config", exist_ok=True)
-    with open("template/config/landing.yaml", "w", encoding="utf-8") as f:
-        yaml.dump(config, f, allow_unicode=True, sort_keys=False)
+    # Parsed once per process; returns an editable copy of the shared view
+    return thaw(read_config("landing"))
+
+def save_config(config: Dict[str, Any]) -> Optional[str]:
+    """Save configuration file if it changed; returns the new version or None"""
+    # Written atomically, so the site never reads a half-written file
+    return write_config("landing", config)
 
 def load_auth_config() -> Dict[str, Any]:
     """Load auth.yaml configuration file"""
-    try:
-        with open("template/config/auth.yaml", "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
-        # If file doesn't exist, return empty dictionary
-        return {}
+    # Parsed once per process; returns an editable copy of the shared view
+    return thaw(read_config("auth"))
 
-def save_auth_config(config: Dict[str, Any]) -> None:
-    """Save auth.yaml configuration file"""
-    # Ensure directory exists
-    os.makedirs("template/config", exist_ok=True)
-    with open("template/config/auth.yaml", "w", encoding="utf-8") as f:
-        yaml.dump(config, f, allow_unicode=True, sort_keys=False)
+def save_auth_config(config: Dict[str, Any]) -> Optional[str]:
+    """Save auth.yaml configuration file if it changed; returns the new version or None"""
+    return write_config("auth", config)
 
 
-# Load existing configuration
-config = load_config()
-if not config:
-    config = {"landing": {}}
+# Each tab, and each repeated item inside a tab, is an st.fragment: a widget
+# change reruns only the fragment it belongs to, not the other tabs. Item
+# fragments write their values straight into the ItemLists kept in
+# session_state, and every tab writes its section into the config dicts
+# passed to it, which a full rerun (e.g. the Save button) rebuilds from all
+# tabs before saving.
 
-landing_config = config.get("landing", {})
+# Items rendered per page of a list editor
+_PAGE_SIZE = 10
 
-auth_config = load_auth_config()
-if not auth_config:
-    auth_config = {}
+def init_items(state_key: str, values: List[Any]) -> ItemList:
+    """Return the ItemList stored under state_key, creating it from values on first use"""
+    if state_key not in st.session_state:
+        st.session_state[state_key] = ItemList(values)
+    return st.session_state[state_key]
 
+def _matches(value: Dict[str, Any], query: str, fields: Sequence[str]) -> bool:
+    """Internal function: Return whether any searched field of an item contains the query"""
+    query = query.lower()
+    return any(query in str(value.get(field, "")).lower() for field in fields)
 
+def _append_item(items: ItemList, new_item: Callable[[], Any], page_key: str) -> None:
+    """Internal function: Add a new item at the end and show the last page"""
+    items.append(new_item())
+    # Clamped to the last page on the next run
+    st.session_state[page_key] = len(items)
 
+def _insert_item(items: ItemList, item_id: int, new_item: Callable[[], Any]) -> None:
+    """Internal function: Add a new item right after item_id"""
+    items.insert_after(item_id, new_item())
 
-# Title
-st.title("Website Configuration Editor")
-st.markdown("Modify website content and appearance through this form. Click the 'Save Changes' button at the bottom when finished.")
-st.markdown("**Note:** The lite version does not support auth.yaml editing except for footer settings. Skip the auth.yaml section if using the lite version.")
+def list_editor(
+    state_key: str,
+    label: str,
+    new_item: Callable[[], Any],
+    item_editor: Callable[[str, int], None],
+    search_fields: Sequence[str] = (),
+    min_items: int = 1,
+    page_size: int = _PAGE_SIZE,
+) -> None:
+    """Render one page of a list with search, pagination and per-item controls
 
-# Use tabs to organize different sections of settings
-tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["Hero Section", "Features", "Demo Experience", "Pricing Plans", "FAQ", "Footer Settings"])
+    Parameters:
+        state_key: session_state key of the ItemList being edited
+        label: Item name used in headings and buttons, e.g. "Q&A"
+        new_item: Function returning the value of a new item
+        item_editor: Fragment drawing the widgets of one item, called as item_editor(state_key, item_id)
+        search_fields: Item fields matched by the search box (no search box when empty)
+        min_items: Number of items below which deleting is disabled
+        page_size: Number of items rendered at once
+
+    Only the items on the visible page get widgets; the others keep their
+    values in the ItemList. Widget keys use the stable item ids, so moving or
+    deleting an item never hands its state to a neighbour.
+    """
+    items = st.session_state[state_key]
+
+    query = ""
+    if search_fields:
+        query = st.text_input(f"Search {label}", key=f"{state_key}_search").strip()
+    if query:
+        matches = [(n, item_id) for n, (item_id, value) in enumerate(items, 1) if _matches(value, query, search_fields)]
+        total = len(matches)
+        st.caption(f"{total} of {len(items)} items match")
+    else:
+        total = len(items)
+
+    pages = max(1, -(-total // page_size))
+    page_key = f"{state_key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, key=page_key) if pages > 1 else 1
+
+    start = (page - 1) * page_size
+    if query:
+        visible = matches[start:start + page_size]
+    else:
+        visible = [(start + n, item_id) for n, (item_id, _) in enumerate(items.page(start, page_size), 1)]
+
+    for number, item_id in visible:
+        col_title, col_up, col_down, col_insert, col_delete = st.columns([8, 1, 1, 1, 1])
+        col_title.markdown(f"#### {label} {number}")
+        col_up.button("⬆", key=f"{state_key}_{item_id}_up", help="Move up",
+                      on_click=items.move_up, args=(item_id,), disabled=item_id == items.head)
+        col_down.button("⬇", key=f"{state_key}_{item_id}_down", help="Move down",
+                        on_click=items.move_down, args=(item_id,), disabled=item_id == items.tail)
+        col_insert.button("➕", key=f"{state_key}_{item_id}_insert", help="Insert below",
+                          on_click=_insert_item, args=(items, item_id, new_item))
+        col_delete.button("🗑", key=f"{state_key}_{item_id}_delete", help="Delete",
+                          on_click=items.remove, args=(item_id,), disabled=len(items) <= min_items)
+        item_editor(state_key, item_id)
+        st.markdown("---")
+
+    st.button(f"➕ Add {label}", key=f"{state_key}_add", on_click=_append_item, args=(items, new_item, page_key))
 
 # Hero section settings
-with tab1:
+@st.fragment
+def hero_tab(landing_config: Dict[str, Any]) -> None:
+    """Edit the hero section"""
     st.header("Hero Section Settings")
-    
+
     hero_config = landing_config.get("hero", {})
-    
+
     # Heading
     hero_heading = st.text_area(
-        "Heading Text", 
+        "Heading Text",
         value=hero_config.get("heading", "Easily Create Lightweight Software Services<br>Micro SaaS"),
         help="Use <br> for line breaks"
     )
-    
+
     # CTA button text
     hero_cta_text = st.text_input(
         "Button Text",
         value=hero_config.get("cta_button", {}).get("text", "Try Now")
     )
-    
+
     # Video source (optional)
     hero_video_source = st.text_input(
         "Video Source URL",
         value=hero_config.get("video", {}).get("source", "")
     )
-    
+
     # Update configuration
     if "hero" not in landing_config:
         landing_config["hero"] = {}
-    
+
     landing_config["hero"]["section_id"] = "home"  # Fixed value
     landing_config["hero"]["heading"] = hero_heading
-    
+
     if "cta_button" not in landing_config["hero"]:
         landing_config["hero"]["cta_button"] = {}
-    
+
     landing_config["hero"]["cta_button"]["text"] = hero_cta_text
     landing_config["hero"]["cta_button"]["link"] = "/app"  # Fixed value
     landing_config["hero"]["cta_button"]["icon"] = "bi bi-chevron-right"  # Fixed value
-    
+
     if hero_video_source:
         if "video" not in landing_config["hero"]:
             landing_config["hero"]["video"] = {}
         landing_config["hero"]["video"]["source"] = hero_video_source
         landing_config["hero"]["video"]["type"] = "video/mp4"  # Fixed value
+
 # Features section settings
-with tab2:
+def new_feature_item() -> Dict[str, Any]:
+    """Return an empty feature item"""
+    return {
+        "column_width": "4",
+        "icon_url": "",
+        "icon_alt": "",
+        "title": "",
+        "description": ""
+    }
+
+@st.fragment
+def feature_item_editor(state_key: str, item_id: int) -> None:
+    """Edit one feature item in place"""
+    items = st.session_state[state_key]
+    # The item may have been deleted since this fragment was last drawn
+    if item_id not in items:
+        return
+    item = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        title = st.text_input(
+            "Title",
+            value=item.get("title", ""),
+            key=f"{key}_title"
+        )
+        icon_url = st.text_input(
+            "Icon URL",
+            value=item.get("icon_url", ""),
+            key=f"{key}_icon_url"
+        )
+        icon_alt = st.text_input(
+            "Icon Alt Text",
+            value=item.get("icon_alt", ""),
+            key=f"{key}_icon_alt"
+        )
+
+    with col2:
+        column_width = st.select_slider(
+            "Column Width",
+            options=["4", "5", "6", "7", "8"],
+            value=item.get("column_width", "4"),
+            key=f"{key}_column_width"
+        )
+        description = st.text_area(
+            "Description",
+            value=item.get("description", ""),
+            key=f"{key}_description"
+        )
+
+    items[item_id] = {
+        "column_width": column_width,
+        "icon_url": icon_url,
+        "icon_alt": icon_alt,
+        "title": title,
+        "description": description
+    }
+
+@st.fragment
+def feature_tab(landing_config: Dict[str, Any]) -> None:
+    """Edit the features section"""
     st.header("Features Section Settings")
-    
+
     feature_config = landing_config.get("feature", {})
-    
+
     # Title and subtitle
     feature_title = st.text_input(
         "Title",
         value=feature_config.get("title", "Service Features")
     )
-    
+
     feature_subtitle = st.text_input(
         "Subtitle",
         value=feature_config.get("subtitle", "Integrated Professional Tools, All-in-One Solution")
     )
-    
+
     # Feature items
     st.subheader("Feature Items")
-    
-    # Initialize session_state to store feature items
-    if "feature_items" not in st.session_state:
-        feature_items = feature_config.get("list_item", [])
-        
-        # Ensure there's at least one item
-        if not feature_items:
-            feature_items = [{
-                "column_width": "4",
-                "icon_url": "",
-                "icon_alt": "",
-                "title": "",
-                "description": ""
-            }]
-        
-        st.session_state.feature_items = feature_items
-    
-    # Function to add a feature item
-    def add_feature_item():
-        st.session_state.feature_items.append({
-            "column_width": "4",
-            "icon_url": "",
-            "icon_alt": "",
-            "title": "",
-            "description": ""
-        })
-    
-    # Function to delete a feature item
-    def delete_last_feature_item():
-        if len(st.session_state.feature_items) > 1:
-            st.session_state.feature_items.pop()
-    
-    # Dynamically generate feature item editing areas
-    updated_feature_items = []
-    
-    for i, item in enumerate(st.session_state.feature_items):
-        st.markdown(f"#### Item {i+1}")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            title = st.text_input(
-                f"Title #{i+1}", 
-                value=item.get("title", ""),
-                key=f"feature_title_{i}"
-            )
-            icon_url = st.text_input(
-                f"Icon URL #{i+1}", 
-                value=item.get("icon_url", ""),
-                key=f"feature_icon_url_{i}"
-            )
-            icon_alt = st.text_input(
-                f"Icon Alt Text #{i+1}", 
-                value=item.get("icon_alt", ""),
-                key=f"feature_icon_alt_{i}"
-            )
-        
-        with col2:
-            column_width = st.select_slider(
-                f"Column Width #{i+1}",
-                options=["4", "5", "6", "7", "8"],
-                value=item.get("column_width", "4"),
-                key=f"feature_column_width_{i}"
-            )
-            description = st.text_area(
-                f"Description #{i+1}", 
-                value=item.get("description", ""),
-                key=f"feature_description_{i}"
-            )
-        
-        updated_feature_items.append({
-            "column_width": column_width,
-            "icon_url": icon_url,
-            "icon_alt": icon_alt,
-            "title": title,
-            "description": description
-        })
-        
-        if i < len(st.session_state.feature_items) - 1:
-            st.markdown("---")
-    
-    # Update feature items in session_state
-    st.session_state.feature_items = updated_feature_items
-    
-    # Buttons to add/delete items
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button("➕ Add Feature Item", on_click=add_feature_item, key="add_feature_item")
-    
-    with col2:
-        st.button("➖ Delete Last Item", 
-                on_click=delete_last_feature_item, 
-                disabled=len(st.session_state.feature_items) <= 1,
-                key="delete_feature_item")
-    
+
+    # Ensure there's at least one item
+    feature_items = init_items("feature_items", feature_config.get("list_item", []) or [new_feature_item()])
+
+    list_editor("feature_items", "Item", new_feature_item, feature_item_editor,
+                search_fields=("title", "description"))
+
     # Update configuration
     if "feature" not in landing_config:
         landing_config["feature"] = {}
-    
+
     landing_config["feature"]["section_id"] = "feature"  # Fixed value
     landing_config["feature"]["title"] = feature_title
     landing_config["feature"]["subtitle"] = feature_subtitle
-    landing_config["feature"]["list_item"] = st.session_state.feature_items
-# Demo Experience Settings    
-with tab3:
+    landing_config["feature"]["list_item"] = feature_items.values()
+
+# Demo Experience Settings
+def new_benefit() -> Dict[str, Any]:
+    """Return an empty benefit"""
+    return {
+        "icon_class": "fas fa-star",
+        "title": "",
+        "description": ""
+    }
+
+@st.fragment
+def benefit_editor(state_key: str, item_id: int) -> None:
+    """Edit one demo benefit in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    benefit = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    icon_class = st.text_input(
+        "Icon Class",
+        value=benefit.get("icon_class", "fas fa-robot"),
+        help="Use Font Awesome icon classes, e.g., fas fa-robot",
+        key=f"{key}_icon_class"
+    )
+
+    title = st.text_input(
+        "Title",
+        value=benefit.get("title", ""),
+        key=f"{key}_title"
+    )
+    description = st.text_area(
+        "Description",
+        value=benefit.get("description", ""),
+        key=f"{key}_description"
+    )
+
+    items[item_id] = {
+        "icon_class": icon_class,
+        "title": title,
+        "description": description
+    }
+
+def new_cta_button() -> Dict[str, Any]:
+    """Return a new CTA button"""
+    return {
+        "class": "cta-button-class",
+        "link": "/app",
+        "text": "New Button"
+    }
+
+@st.fragment
+def cta_button_editor(state_key: str, item_id: int) -> None:
+    """Edit one demo CTA button in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    button = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    text = st.text_input(
+        "Button Text",
+        value=button.get("text", ""),
+        key=f"{key}_text"
+    )
+    link = st.text_input(
+        "Link",
+        value=button.get("link", "/app"),
+        key=f"{key}_link"
+    )
+
+    # Optional fields
+    icon = st.text_input(
+        "Icon (Optional)",
+        value=button.get("icon", ""),
+        help="Use Bootstrap Icons classes, e.g., bi bi-magic",
+        key=f"{key}_icon"
+    )
+
+    button_class = st.text_input(
+        "CSS Class",
+        value=button.get("class", "cta-button white"),
+        help="CSS class for the button, e.g., cta-button white",
+        key=f"{key}_class"
+    )
+
+    button_data = {
+        "class": button_class,
+        "link": link,
+        "text": text
+    }
+
+    if icon:
+        button_data["icon"] = icon
+
+    items[item_id] = button_data
+
+@st.fragment
+def demo_tab(landing_config: Dict[str, Any]) -> None:
+    """Edit the demo experience section"""
     st.header("Demo Experience Settings")
-    
+
     demo_config = landing_config.get("demo", {})
-    
+
     # Title and main title
     demo_heading = st.text_area(
         "Heading",
         value=demo_config.get("heading", "Streamlit+ AI Powered<br>Quick Generator"),
         help="Use <br> for line breaks"
     )
-    
+
     demo_main_title = st.text_input(
         "Main Title",
         value=demo_config.get("main_title", "Focus on developing your Streamlit app, leave membership management and payment processing to us!")
     )
-    
+
     # Image settings
     demo_image_src = st.text_input(
         "Image Source",
         value=demo_config.get("image", {}).get("src", "app/static/cycles.webp")
     )
-    
+
     # Benefits items
     st.subheader("Benefits")
-    
-    # Initialize session_state to store benefit items
-    if "demo_benefits" not in st.session_state:
-        benefits = demo_config.get("benefits", [])
-        
-        # Ensure there's at least one item
-        if not benefits:
-            benefits = [{
-                "icon_class": "fas fa-robot",
-                "title": "",
-                "description": ""
-            }]
-        
-        st.session_state.demo_benefits = benefits
-    
-    # Function to add a benefit item
-    def add_benefit():
-        st.session_state.demo_benefits.append({
-            "icon_class": "fas fa-star",
-            "title": "",
-            "description": ""
-        })
-    
-    # Function to delete a benefit item
-    def delete_last_benefit():
-        if len(st.session_state.demo_benefits) > 1:
-            st.session_state.demo_benefits.pop()
-    
-    # Dynamically generate benefit item editing areas
-    updated_benefits = []
-    
-    for i, benefit in enumerate(st.session_state.demo_benefits):
-        st.markdown(f"#### Benefit {i+1}")
-        
-        icon_class = st.text_input(
-            f"Icon Class #{i+1}", 
-            value=benefit.get("icon_class", "fas fa-robot"),
-            help="Use Font Awesome icon classes, e.g., fas fa-robot",
-            key=f"benefit_icon_class_{i}"
-        )
-        
-        title = st.text_input(
-            f"Title #{i+1}", 
-            value=benefit.get("title", ""),
-            key=f"benefit_title_{i}"
-        )
-        description = st.text_area(
-            f"Description #{i+1}", 
-            value=benefit.get("description", ""),
-            key=f"benefit_description_{i}"
-        )
-        
-        updated_benefits.append({
-            "icon_class": icon_class,
-            "title": title,
-            "description": description
-        })
-        
-        if i < len(st.session_state.demo_benefits) - 1:
-            st.markdown("---")
-    
-    # Update benefit items in session_state
-    st.session_state.demo_benefits = updated_benefits
-    
-    # Buttons to add/delete benefits
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button("➕ Add Benefit", on_click=add_benefit, key="add_benefit")
-    
-    with col2:
-        st.button("➖ Delete Last Benefit", 
-                on_click=delete_last_benefit, 
-                disabled=len(st.session_state.demo_benefits) <= 1,
-                key="delete_benefit")
-    
+
+    # Ensure there's at least one item
+    benefits = init_items("demo_benefits", demo_config.get("benefits", []) or [{
+        "icon_class": "fas fa-robot",
+        "title": "",
+        "description": ""
+    }])
+
+    list_editor("demo_benefits", "Benefit", new_benefit, benefit_editor,
+                search_fields=("title", "description"))
+
     # CTA buttons
     st.subheader("CTA Buttons")
-    
-    # Initialize session_state to store CTA buttons
-    if "cta_buttons" not in st.session_state:
-        cta_buttons = demo_config.get("cta_buttons", [])
-        
-        # Ensure there's at least one button
-        if not cta_buttons:
-            cta_buttons = [{
-                "class": "cta-button white",
-                "link": "/app",
-                "icon": "bi bi-magic",
-                "text": "Try AI Generator"
-            }]
-        
-        st.session_state.cta_buttons = cta_buttons
-    
-    # Function to add a CTA button
-    def add_cta_button():
-        st.session_state.cta_buttons.append({
-            "class": "cta-button-class",
-            "link": "/app",
-            "text": "New Button"
-        })
-    
-    # Function to delete a CTA button
-    def delete_last_cta_button():
-        if len(st.session_state.cta_buttons) > 1:
-            st.session_state.cta_buttons.pop()
-    
-    # Dynamically generate button editing areas
-    updated_cta_buttons = []
-    
-    for i, button in enumerate(st.session_state.cta_buttons):
-        st.markdown(f"#### Button {i+1}")
-        
-        text = st.text_input(
-            f"Button Text #{i+1}", 
-            value=button.get("text", ""),
-            key=f"cta_text_{i}"
-        )
-        link = st.text_input(
-            f"Link #{i+1}", 
-            value=button.get("link", "/app"),
-            key=f"cta_link_{i}"
-        )
-        
-        # Optional fields
-        icon = st.text_input(
-            f"Icon (Optional) #{i+1}", 
-            value=button.get("icon", ""),
-            help="Use Bootstrap Icons classes, e.g., bi bi-magic",
-            key=f"cta_icon_{i}"
-        )
-        
-        button_class = st.text_input(
-            f"CSS Class #{i+1}", 
-            value=button.get("class", "cta-button white"),
-            help="CSS class for the button, e.g., cta-button white",
-            key=f"cta_class_{i}"
-        )
-        
-        button_data = {
-            "class": button_class,
-            "link": link,
-            "text": text
-        }
-        
-        if icon:
-            button_data["icon"] = icon
-            
-        updated_cta_buttons.append(button_data)
-        
-        if i < len(st.session_state.cta_buttons) - 1:
-            st.markdown("---")
-    
-    # Update CTA buttons in session_state
-    st.session_state.cta_buttons = updated_cta_buttons
-    
-    # Buttons to add/delete CTA buttons
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button("➕ Add Button", on_click=add_cta_button, key="add_cta_button")
-    
-    with col2:
-        st.button("➖ Delete Last Button", 
-                on_click=delete_last_cta_button, 
-                disabled=len(st.session_state.cta_buttons) <= 1,
-                key="delete_cta_button")
-    
+
+    # Ensure there's at least one button
+    cta_buttons = init_items("cta_buttons", demo_config.get("cta_buttons", []) or [{
+        "class": "cta-button white",
+        "link": "/app",
+        "icon": "bi bi-magic",
+        "text": "Try AI Generator"
+    }])
+
+    list_editor("cta_buttons", "Button", new_cta_button, cta_button_editor)
+
     # Update configuration
     if "demo" not in landing_config:
         landing_config["demo"] = {}
-    
+
     landing_config["demo"]["section_id"] = "demo"  # Fixed value
     landing_config["demo"]["heading"] = demo_heading
     landing_config["demo"]["main_title"] = demo_main_title
-    
+
     if "image" not in landing_config["demo"]:
         landing_config["demo"]["image"] = {}
-    
+
+    previous_src = landing_config["demo"]["image"].get("src")
     landing_config["demo"]["image"]["src"] = demo_image_src
-    landing_config["demo"]["image"]["height"] = "1028"  # Fixed value
-    landing_config["demo"]["image"]["width"] = "2168"  # Fixed value
-    
-    landing_config["demo"]["benefits"] = st.session_state.demo_benefits
-    landing_config["demo"]["cta_buttons"] = st.session_state.cta_buttons
+    # The real dimensions, from the image manifest or the local file; unknown for remote images
+    demo_image_size = image_size(demo_image_src)
+    if demo_image_size:
+        landing_config["demo"]["image"]["width"] = str(demo_image_size[0])
+        landing_config["demo"]["image"]["height"] = str(demo_image_size[1])
+    elif demo_image_src != previous_src:
+        # Sizes written by hand for the same image are kept, never those of a previous image
+        landing_config["demo"]["image"].pop("height", None)
+        landing_config["demo"]["image"].pop("width", None)
+
+    landing_config["demo"]["benefits"] = benefits.values()
+    landing_config["demo"]["cta_buttons"] = cta_buttons.values()
+
 # Pricing Plans Settings
-with tab4:
+def new_pricing_plan() -> Dict[str, Any]:
+    """Return a new pricing plan"""
+    return {
+        "name": "New Plan",
+        "is_popular": False,
+        "price": "$0",
+        "price_period": "/month",
+        "ai_quota": "AI generation quota per month",
+        "features": ["Feature 1", "Feature 2"],
+        "button": {
+            "link": "#",
+            "class": "btn btn-outline w-100",
+            "text": "Select Plan"
+        }
+    }
+
+@st.fragment
+def plan_feature_editor(state_key: str, item_id: int) -> None:
+    """Edit one line of a plan's feature list in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    items[item_id] = st.text_input(
+        "Feature",
+        value=items[item_id],
+        key=f"{state_key}_{item_id}_text",
+        label_visibility="collapsed"
+    )
+
+def plan_features(state_key: str, item_id: int, plan: Dict[str, Any]) -> List[str]:
+    """Return the edited feature list of a plan, or its loaded one if it was never shown"""
+    features = st.session_state.get(f"{state_key}_{item_id}_features")
+    return features.values() if features is not None else plan.get("features", [])
+
+@st.fragment
+def plan_editor(state_key: str, item_id: int) -> None:
+    """Edit one pricing plan, including its feature list, in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    plan = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        name = st.text_input(
+            "Plan Name",
+            value=plan.get("name", ""),
+            key=f"{key}_name"
+        )
+        price = st.text_input(
+            "Price",
+            value=plan.get("price", "$0"),
+            key=f"{key}_price"
+        )
+        price_period = st.text_input(
+            "Price Period",
+            value=plan.get("price_period", "/month"),
+            key=f"{key}_price_period"
+        )
+        ai_quota = st.text_input(
+            "AI Quota",
+            value=plan.get("ai_quota", "1 AI generation per month"),
+            key=f"{key}_ai_quota"
+        )
+
+    with col2:
+        is_popular = st.checkbox(
+            "Is Popular Plan",
+            value=plan.get("is_popular", False),
+            key=f"{key}_is_popular"
+        )
+
+        popular_badge_text = ""
+        if is_popular:
+            popular_badge_text = st.text_input(
+                "Popular Badge Text",
+                value=plan.get("popular_badge_text", "Most Popular"),
+                key=f"{key}_popular_badge_text"
+            )
+
+    # Features list
+    st.markdown("##### Features List")
+
+    # Ensure there's at least one feature
+    init_items(f"{key}_features", plan.get("features", []) or [""])
+    list_editor(f"{key}_features", "Feature", str, plan_feature_editor, page_size=50)
+
+    # Button settings
+    st.markdown("##### Button Settings")
+
+    button = plan.get("button", {})
+    button_text = st.text_input(
+        "Button Text",
+        value=button.get("text", "Get Started"),
+        key=f"{key}_button_text"
+    )
+    button_link = st.text_input(
+        "Button Link",
+        value=button.get("link", ""),
+        key=f"{key}_button_link"
+    )
+    button_class = st.text_input(
+        "Button CSS Class",
+        value=button.get("class", "btn btn-outline w-100"),
+        help="CSS class for the button, e.g., btn btn-outline w-100",
+        key=f"{key}_button_class"
+    )
+
+    # Build plan data
+    plan_data = {
+        "name": name,
+        "is_popular": is_popular,
+        "price": price,
+        "price_period": price_period,
+        "ai_quota": ai_quota,
+        "features": plan_features(state_key, item_id, plan),
+        "button": {
+            "link": button_link,
+            "class": button_class,
+            "text": button_text
+        }
+    }
+
+    if is_popular:
+        plan_data["popular_badge_text"] = popular_badge_text
+
+    items[item_id] = plan_data
+
+def pricing_plan_values() -> List[Dict[str, Any]]:
+    """Return the edited plans with their feature lists"""
+    # Feature lists are edited in their own fragments, so read them back here
+    return [
+        {**plan, "features": plan_features("pricing_plans", item_id, plan)}
+        for item_id, plan in st.session_state.pricing_plans
+    ]
+
+@st.fragment
+def pricing_tab(landing_config: Dict[str, Any]) -> None:
+    """Edit the pricing section"""
     st.header("Pricing Plans Settings")
-    
+
     pricing_config = landing_config.get("pricing", {})
-    
+
     # Title
     pricing_title = st.text_input(
         "Title",
         value=pricing_config.get("title", "Choose Your Plan")
     )
-    
+
     # Plan items
     st.subheader("Plan Items")
-    
-    # Initialize session_state to store plans
-    if "pricing_plans" not in st.session_state:
-        plans = pricing_config.get("plans", [])
-        
-        # Ensure there's at least one plan
-        if not plans:
-            plans = [{
-                "name": "Free Plan",
-                "is_popular": False,
-                "price": "$0",
-                "price_period": "/month",
-                "ai_quota": "1 AI generation per month",
-                "features": ["Basic layout templates", "Social sharing features", "Basic code optimization"],
-                "button": {
-                    "link": "https://www.patreon.com/c/3droid/membership",
-                    "class": "btn btn-outline w-100",
-                    "text": "Get Started"
-                }
-            }]
-        
-        st.session_state.pricing_plans = plans
-    
-    # Function to add a pricing plan
-    def add_pricing_plan():
-        st.session_state.pricing_plans.append({
-            "name": "New Plan",
-            "is_popular": False,
-            "price": "$0",
-            "price_period": "/month",
-            "ai_quota": "AI generation quota per month",
-            "features": ["Feature 1", "Feature 2"],
-            "button": {
-                "link": "#",
-                "class": "btn btn-outline w-100",
-                "text": "Select Plan"
-            }
-        })
-    
-    # Function to delete a pricing plan
-    def delete_last_pricing_plan():
-        if len(st.session_state.pricing_plans) > 1:
-            st.session_state.pricing_plans.pop()
-    
-    # Dynamically generate plan editing areas
-    updated_plans = []
-    
-    for i, plan in enumerate(st.session_state.pricing_plans):
-        st.markdown(f"#### Plan {i+1}")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            name = st.text_input(
-                f"Plan Name #{i+1}", 
-                value=plan.get("name", ""),
-                key=f"plan_name_{i}"
-            )
-            price = st.text_input(
-                f"Price #{i+1}", 
-                value=plan.get("price", "$0"),
-                key=f"plan_price_{i}"
-            )
-            price_period = st.text_input(
-                f"Price Period #{i+1}", 
-                value=plan.get("price_period", "/month"),
-                key=f"plan_price_period_{i}"
-            )
-            ai_quota = st.text_input(
-                f"AI Quota #{i+1}", 
-                value=plan.get("ai_quota", "1 AI generation per month"),
-                key=f"plan_ai_quota_{i}"
-            )
-        
-        with col2:
-            is_popular = st.checkbox(
-                f"Is Popular Plan #{i+1}", 
-                value=plan.get("is_popular", False),
-                key=f"plan_is_popular_{i}"
-            )
-            
-            popular_badge_text = ""
-            if is_popular:
-                popular_badge_text = st.text_input(
-                    f"Popular Badge Text #{i+1}", 
-                    value=plan.get("popular_badge_text", "Most Popular"),
-                    key=f"plan_popular_badge_text_{i}"
-                )
-        
-        # Features list
-        st.markdown(f"##### Features List #{i+1}")
-        
-        # Initialize features list session_state for this plan
-        plan_features_key = f"plan_{i}_features"
-        if plan_features_key not in st.session_state:
-            features = plan.get("features", [])
-            
-            # Ensure there's at least one feature
-            if not features:
-                features = [""]
-            
-            st.session_state[plan_features_key] = features
-        
-        # Function to add a feature to a plan
-        def add_feature_to_plan(plan_idx):
-            return lambda: st.session_state[f"plan_{plan_idx}_features"].append("")
-        
-        # Function to delete a feature from a plan
-        def delete_last_feature_from_plan(plan_idx):
-            return lambda: st.session_state[f"plan_{plan_idx}_features"].pop() if len(st.session_state[f"plan_{plan_idx}_features"]) > 1 else None
-        
-        # Dynamically generate features list editing areas
-        updated_features = []
-        
-        for j, feature in enumerate(st.session_state[plan_features_key]):
-            feature_text = st.text_input(
-                f"Feature #{i+1}-{j+1}", 
-                value=feature,
-                key=f"plan_{i}_feature_{j}"
-            )
-            updated_features.append(feature_text)
-        
-        # Update features list in session_state
-        st.session_state[plan_features_key] = updated_features
-        
-        # Buttons to add/delete features
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.button(
-                f"➕ Add Feature #{i+1}", 
-                on_click=add_feature_to_plan(i),
-                key=f"add_feature_to_plan_{i}"
-            )
-        
-        with col2:
-            st.button(
-                f"➖ Delete Last Feature #{i+1}", 
-                on_click=delete_last_feature_from_plan(i),
-                disabled=len(st.session_state[plan_features_key]) <= 1,
-                key=f"delete_feature_from_plan_{i}"
-            )
-        
-        # Button settings
-        st.markdown(f"##### Button Settings #{i+1}")
-        
-        button = plan.get("button", {})
-        button_text = st.text_input(
-            f"Button Text #{i+1}", 
-            value=button.get("text", "Get Started"),
-            key=f"plan_button_text_{i}"
-        )
-        button_link = st.text_input(
-            f"Button Link #{i+1}", 
-            value=button.get("link", ""),
-            key=f"plan_button_link_{i}"
-        )
-        button_class = st.text_input(
-            f"Button CSS Class #{i+1}", 
-            value=button.get("class", "btn btn-outline w-100"),
-            help="CSS class for the button, e.g., btn btn-outline w-100",
-            key=f"plan_button_class_{i}"
-        )
-        
-        # Build plan data
-        plan_data = {
-            "name": name,
-            "is_popular": is_popular,
-            "price": price,
-            "price_period": price_period,
-            "ai_quota": ai_quota,
-            "features": st.session_state[plan_features_key],
-            "button": {
-                "link": button_link,
-                "class": button_class,
-                "text": button_text
-            }
+
+    # Ensure there's at least one plan
+    init_items("pricing_plans", pricing_config.get("plans", []) or [{
+        "name": "Free Plan",
+        "is_popular": False,
+        "price": "$0",
+        "price_period": "/month",
+        "ai_quota": "1 AI generation per month",
+        "features": ["Basic layout templates", "Social sharing features", "Basic code optimization"],
+        "button": {
+            "link": "https://www.patreon.com/c/3droid/membership",
+            "class": "btn btn-outline w-100",
+            "text": "Get Started"
         }
-        
-        if is_popular:
-            plan_data["popular_badge_text"] = popular_badge_text
-            
-        updated_plans.append(plan_data)
-        
-        if i < len(st.session_state.pricing_plans) - 1:
-            st.markdown("---")
-    
-    # Update plans in session_state
-    st.session_state.pricing_plans = updated_plans
-    
-    # Buttons to add/delete plans
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button("➕ Add Plan", on_click=add_pricing_plan, key="add_pricing_plan")
-    
-    with col2:
-        st.button("➖ Delete Last Plan", 
-                on_click=delete_last_pricing_plan, 
-                disabled=len(st.session_state.pricing_plans) <= 1,
-                key="delete_pricing_plan")
-    
+    }])
+
+    list_editor("pricing_plans", "Plan", new_pricing_plan, plan_editor,
+                search_fields=("name", "price"))
+
     # Update configuration
     if "pricing" not in landing_config:
         landing_config["pricing"] = {}
-    
+
     landing_config["pricing"]["section_id"] = "pricing"  # Fixed value
     landing_config["pricing"]["title"] = pricing_title
     landing_config["pricing"]["feature_icon"] = "fas fa-check"  # Fixed value
-    landing_config["pricing"]["plans"] = st.session_state.pricing_plans
+    landing_config["pricing"]["plans"] = pricing_plan_values()
+
 # FAQ Settings
-with tab5:
+def new_faq_item() -> Dict[str, Any]:
+    """Return an empty FAQ item"""
+    return {
+        "question": "",
+        "answer": ""
+    }
+
+@st.fragment
+def faq_item_editor(state_key: str, item_id: int) -> None:
+    """Edit one FAQ item in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    item = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    question = st.text_input(
+        "Question",
+        value=item.get("question", ""),
+        key=f"{key}_question"
+    )
+    answer = st.text_area(
+        "Answer",
+        value=item.get("answer", ""),
+        key=f"{key}_answer"
+    )
+
+    items[item_id] = {
+        "question": question,
+        "answer": answer
+    }
+
+@st.fragment
+def faq_tab(landing_config: Dict[str, Any]) -> None:
+    """Edit the FAQ section"""
     st.header("FAQ Settings")
-    
+
     faq_config = landing_config.get("faq", {})
-    
+
     # Title
     faq_title = st.text_input(
         "Title",
         value=faq_config.get("title", "Frequently Asked Questions")
     )
-    
+
     # FAQ Items
     st.subheader("FAQ Items")
-    
-    # Initialize session_state to store FAQ items
-    if "faq_items" not in st.session_state:
-        faq_items = faq_config.get("faq_items", [])
-        
-        # Ensure there's at least one FAQ item
-        if not faq_items:
-            faq_items = [{
-                "question": "Question?",
-                "answer": "Answer..."
-            }]
-        
-        st.session_state.faq_items = faq_items
-    
-    # Function to add an FAQ item
-    def add_faq_item():
-        st.session_state.faq_items.append({
-            "question": "",
-            "answer": ""
-        })
-    
-    # Function to delete an FAQ item
-    def delete_last_faq_item():
-        if len(st.session_state.faq_items) > 1:
-            st.session_state.faq_items.pop()
-    
-    # Dynamically generate FAQ item editing areas
-    updated_faq_items = []
-    
-    for i, item in enumerate(st.session_state.faq_items):
-        st.markdown(f"#### Q&A {i+1}")
-        
-        question = st.text_input(
-            f"Question #{i+1}", 
-            value=item.get("question", ""),
-            key=f"faq_question_{i}"
-        )
-        answer = st.text_area(
-            f"Answer #{i+1}", 
-            value=item.get("answer", ""),
-            key=f"faq_answer_{i}"
-        )
-        
-        updated_faq_items.append({
-            "question": question,
-            "answer": answer
-        })
-        
-        if i < len(st.session_state.faq_items) - 1:
-            st.markdown("---")
-    
-    # Update FAQ items in session_state
-    st.session_state.faq_items = updated_faq_items
-    
-    # Buttons to add/delete FAQ items
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button("➕ Add FAQ Item", on_click=add_faq_item)
-    
-    with col2:
-        st.button("➖ Delete Last FAQ Item", on_click=delete_last_faq_item, 
-                disabled=len(st.session_state.faq_items) <= 1)
-    
+
+    # Ensure there's at least one FAQ item
+    faq_items = init_items("faq_items", faq_config.get("faq_items", []) or [{
+        "question": "Question?",
+        "answer": "Answer..."
+    }])
+
+    list_editor("faq_items", "Q&A", new_faq_item, faq_item_editor,
+                search_fields=("question", "answer"))
+
     # Update configuration
     if "faq" not in landing_config:
         landing_config["faq"] = {}
-    
+
     landing_config["faq"]["title"] = faq_title
-    landing_config["faq"]["faq_items"] = st.session_state.faq_items
+    landing_config["faq"]["faq_items"] = faq_items.values()
 
 # Footer settings
-with tab6:
+def new_social_link() -> Dict[str, Any]:
+    """Return an empty social link"""
+    return {
+        "name": "",
+        "url": "",
+        "icon": ""
+    }
+
+@st.fragment
+def social_link_editor(state_key: str, item_id: int) -> None:
+    """Edit one footer social link in place"""
+    items = st.session_state[state_key]
+    if item_id not in items:
+        return
+    link = items[item_id]
+    key = f"{state_key}_{item_id}"
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        name = st.text_input(
+            "Platform Name",
+            value=link.get("name", ""),
+            key=f"{key}_name"
+        )
+        icon = st.text_input(
+            "Icon Code",
+            value=link.get("icon", ""),
+            key=f"{key}_icon"
+        )
+
+    with col2:
+        url = st.text_input(
+            "Link URL",
+            value=link.get("url", ""),
+            key=f"{key}_url"
+        )
+
+    items[item_id] = {
+        "name": name,
+        "url": url,
+        "icon": icon
+    }
+
+@st.fragment
+def footer_tab(auth_config: Dict[str, Any]) -> None:
+    """Edit the footer section of auth.yaml"""
     st.header("Footer Settings")
-    
+
     footer_config = auth_config.get("footer", {})
-    
+
     # Logo settings
     st.subheader("Logo Settings")
     logo_src = st.text_input(
@@ -764,108 +758,207 @@ with tab6:
         "Logo Alt Text",
         value=footer_config.get("logo", {}).get("alt", "3Droid Financial Technology")
     )
-    
+
     # Social links
     st.subheader("Social Links")
-    
-    # Initialize session_state to store social links
-    if "social_links" not in st.session_state:
-        social_links = footer_config.get("social_links", [])
-        if not social_links:
-            social_links = []
-        
-        st.session_state.social_links = social_links
-    
-    # Function to add a social link
-    def add_social_link():
-        st.session_state.social_links.append({
-            "name": "",
-            "url": "",
-            "icon": ""
-        })
-    
-    # Function to delete a social link
-    def delete_last_social_link():
-        if len(st.session_state.social_links) > 0:
-            st.session_state.social_links.pop()
-    
-    # Dynamically generate social link editing areas
-    updated_social_links = []
-    
-    for i, link in enumerate(st.session_state.social_links):
-        st.markdown(f"#### Link {i+1}")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            name = st.text_input(
-                f"Platform Name #{i+1}", 
-                value=link.get("name", ""),
-                key=f"social_name_{i}"
-            )
-            icon = st.text_input(
-                f"Icon Code #{i+1}", 
-                value=link.get("icon", ""),
-                key=f"social_icon_{i}"
-            )
-        
-        with col2:
-            url = st.text_input(
-                f"Link URL #{i+1}", 
-                value=link.get("url", ""),
-                key=f"social_url_{i}"
-            )
-        
-        updated_social_links.append({
-            "name": name,
-            "url": url,
-            "icon": icon
-        })
-        
-        if i < len(st.session_state.social_links) - 1:
-            st.markdown("---")
-    
-    # Update social links in session_state
-    st.session_state.social_links = updated_social_links
-    
-    # Buttons to add/delete social links
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.button(
-            "➕ Add Social Link", 
-            on_click=add_social_link,
-            key="add_social_link"
-        )
-    
-    with col2:
-        st.button(
-            "➖ Delete Last Social Link", 
-            on_click=delete_last_social_link,
-            disabled=len(st.session_state.social_links) <= 0,
-            key="delete_social_link"
-        )
-    
+
+    social_links = init_items("social_links", footer_config.get("social_links", []))
+
+    list_editor("social_links", "Link", new_social_link, social_link_editor,
+                search_fields=("name", "url"), min_items=0)
+
     # Update configuration
     if "footer" not in auth_config:
         auth_config["footer"] = {}
-    
+
     if "logo" not in auth_config["footer"]:
         auth_config["footer"]["logo"] = {}
-    
+
     auth_config["footer"]["logo"]["src"] = logo_src
     auth_config["footer"]["logo"]["alt"] = logo_alt
-    auth_config["footer"]["social_links"] = st.session_state.social_links
+    auth_config["footer"]["social_links"] = social_links.values()
+
+
+# Live preview
+# Config lists edited through list_editor, as (section, field, session_state key)
+_LANDING_LISTS = (
+    ("feature", "list_item", "feature_items"),
+    ("demo", "benefits", "demo_benefits"),
+    ("demo", "cta_buttons", "cta_buttons"),
+    ("faq", "faq_items", "faq_items"),
+)
+
+# Seconds between checks for new edits, and how long the configs must stay
+# unchanged before the preview is rendered again
+_PREVIEW_POLL = 0.5
+_PREVIEW_DEBOUNCE = 1.0
+
+def current_configs(config: Dict[str, Any], auth_config: Dict[str, Any]) -> tuple:
+    """Return copies of both configs with every list read back from its ItemList
+
+    An item fragment reruns without its tab, so the lists the tabs wrote into
+    the configs can lag behind the widgets; the ItemLists never do.
+    """
+    landing = dict(config.get("landing", {}))
+    for section, field, state_key in _LANDING_LISTS:
+        if state_key in st.session_state and section in landing:
+            landing[section] = {**landing[section], field: st.session_state[state_key].values()}
+    if "pricing_plans" in st.session_state and "pricing" in landing:
+        landing["pricing"] = {**landing["pricing"], "plans": pricing_plan_values()}
+
+    auth = dict(auth_config)
+    if "social_links" in st.session_state and "footer" in auth:
+        auth["footer"] = {**auth["footer"], "social_links": st.session_state.social_links.values()}
+    return {**config, "landing": landing}, auth
+
+@st.fragment(run_every=_PREVIEW_POLL)
+def preview_pane(config: Dict[str, Any], auth_config: Dict[str, Any]) -> None:
+    """Show the site rendered from the unsaved configs once edits have settled"""
+    landing, auth = current_configs(config, auth_config)
+    digest = config_digest([landing, auth])
+    preview = st.session_state.setdefault("preview", {"pending": None, "changed_at": 0.0, "digest": None})
+
+    # Debounce: wait until the configs stop changing before rendering
+    now = time.monotonic()
+    if digest != preview["pending"]:
+        preview["pending"] = digest
+        preview["changed_at"] = now
+    if preview["digest"] is None or (
+        digest != preview["digest"] and now - preview["changed_at"] >= _PREVIEW_DEBOUNCE
+    ):
+        # Only sections whose config subtree changed are rendered again
+        try:
+            preview["page"], preview["rendered"] = render_preview(landing, auth)
+            preview["error"] = None
+        except ConfigError as e:
+            preview["error"] = str(e)
+        preview["digest"] = digest
+
+    if preview.get("error"):
+        st.error(f"Invalid configuration: {preview['error']}")
+    if "page" not in preview:
+        return
+    if digest != preview["digest"]:
+        st.caption("Waiting for edits to settle...")
+    elif preview["rendered"]:
+        st.caption(f"Re-rendered: {', '.join(preview['rendered'])}")
+    else:
+        st.caption("Preview is up to date")
+    components.html(preview["page"], height=900, scrolling=True)
+
+
+# YAML view
+@st.cache_data(max_entries=16, show_spinner=False)
+def yaml_text(digest: str, _config: Any) -> str:
+    """Return the YAML dump of a config, memoized on its content hash"""
+    return yaml.dump(thaw(_config), allow_unicode=True, sort_keys=False)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def yaml_diff(name: str, saved_digest: str, edited_digest: str, _saved: Any, _edited: Any) -> str:
+    """Return a unified diff from the saved to the edited config, memoized on both content hashes"""
+    # Both sides are dumped the same way, so formatting-only differences never show up
+    return "\n".join(difflib.unified_diff(
+        yaml_text(saved_digest, _saved).splitlines(),
+        yaml_text(edited_digest, _edited).splitlines(),
+        f"{name}.yaml (saved)",
+        f"{name}.yaml (edited)",
+        lineterm=""
+    ))
+
+
+# Load existing configuration
+config = load_config()
+if not config:
+    config = {"landing": {}}
+
+landing_config = config.get("landing", {})
+
+auth_config = load_auth_config()
+if not auth_config:
+    auth_config = {}
+
+
+
+
+# Title
+st.title("Website Configuration Editor")
+st.markdown("Modify website content and appearance through this form. Click the 'Save Changes' button at the bottom when finished.")
+st.markdown("**Note:** The lite version does not support auth.yaml editing except for footer settings. Skip the auth.yaml section if using the lite version.")
+
+# A file that does not match its model still opens; the site keeps its last valid version until it is fixed
+for name in ("landing", "auth"):
+    error = config_store.error(name)
+    if error:
+        st.warning(f"{error}. The site shows the last valid version until this is fixed and saved.")
+
+show_preview = st.toggle("Live preview", help="Render the unsaved changes with the site's own templates")
+if show_preview:
+    editor_col, preview_col = st.columns([3, 2])
+else:
+    editor_col, preview_col = st.container(), None
+
+# Use tabs to organize different sections of settings
+tab1, tab2, tab3, tab4, tab5, tab6 = editor_col.tabs(["Hero Section", "Features", "Demo Experience", "Pricing Plans", "FAQ", "Footer Settings"])
+
+with tab1:
+    hero_tab(landing_config)
+with tab2:
+    feature_tab(landing_config)
+with tab3:
+    demo_tab(landing_config)
+with tab4:
+    pricing_tab(landing_config)
+with tab5:
+    faq_tab(landing_config)
+with tab6:
+    footer_tab(auth_config)
+
+if preview_col is not None:
+    with preview_col:
+        preview_pane(config, auth_config)
 
 # Save button
 if st.button("Save Changes", type="primary"):
     config["landing"] = landing_config
-    save_config(config)
-    save_auth_config(auth_config)    
-    st.success("Configuration saved successfully!")        
+    saved = []
+    error = None
+    # Only files whose content differs from disk are rewritten; invalid ones are refused
+    try:
+        if save_config(config):
+            saved.append("landing.yaml")
+        if save_auth_config(auth_config):
+            saved.append("auth.yaml")
+    except ConfigError as e:
+        error = str(e)
+    # Drop only the rendered pages built from the saved files
+    for file_name in saved:
+        invalidate_config(file_name[:-len(".yaml")])
+    if saved:
+        st.success(f"Configuration saved successfully! ({', '.join(saved)})")
+    if error:
+        st.error(f"Configuration not saved: {error}")
+    elif not saved:
+        st.info("No changes to save.")
 
 # Display current configuration (development mode only)
 with st.expander("View Current Configuration (YAML format)"):
-    st.code(yaml.dump(config, allow_unicode=True, sort_keys=False), language="yaml")
-    st.code(yaml.dump(auth_config, allow_unicode=True, sort_keys=False), language="yaml")
+    # Serializing a large config is slow, so nothing is dumped until asked for
+    yaml_view = st.radio(
+        "Show",
+        ["Nothing", "Changes against saved files", "Full YAML"],
+        horizontal=True,
+        key="yaml_view"
+    )
+    if yaml_view != "Nothing":
+        edited_config, edited_auth_config = current_configs(config, auth_config)
+        for name, data in (("landing", edited_config), ("auth", edited_auth_config)):
+            edited_digest = config_digest(data)
+            if yaml_view == "Full YAML":
+                st.code(yaml_text(edited_digest, data), language="yaml")
+            else:
+                saved_digest = config_store.digest(name)
+                st.code(
+                    yaml_diff(name, saved_digest, edited_digest, read_config(name), data) or f"{name}.yaml: no changes",
+                    language="diff"
+                )
 
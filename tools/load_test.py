@@ -0,0 +1,255 @@
+"""Load-test Home.py and pages/app.py with many concurrent simulated sessions
+
+Usage:
+    python tools/load_test.py [--output load.json] [--sessions 1 5 10 25 50] [--reruns 10]
+
+For each template mode a Streamlit server is started on 127.0.0.1 with
+LANDING_TEMPLATE_MODE set, and every simulated session is a websocket
+client speaking Streamlit's own protocol, so nothing leaves localhost.
+For each page and session count N, N sessions connect at once and each
+requests reruns back to back. The report gives the latency distribution
+of the first run and of reruns (request to script_finished), reruns per
+second, the server's CPU time per second of wall time, and its resident
+memory before and after. A run that shows an exception or does not finish
+successfully is counted as an error and left out of the latencies.
+Results are written as JSON so runs can be compared between commits.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+# Make the project root importable when run via `python tools/load_test.py`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+
+# Pages driven by the simulated sessions, as (label, page name Streamlit routes by)
+_PAGES = [('Home.py', ''), ('pages/app.py', 'app')]
+
+# Seconds to wait for the server to come up, and for a single script run
+_STARTUP_TIMEOUT = 60
+_RUN_TIMEOUT = 60
+
+# Largest Streamlit message accepted by the client (the landing page is sent in one)
+_MAX_MESSAGE_SIZE = 200 * 2**20
+
+
+def _free_port():
+    """Return a TCP port on 127.0.0.1 that nothing listens on"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _start_server(use_template, port):
+    """Start `streamlit run Home.py` in the given mode; return the process once it is healthy"""
+    env = dict(os.environ, LANDING_TEMPLATE_MODE='1' if use_template else '0')
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', 'Home.py',
+            '--server.address', '127.0.0.1', '--server.port', str(port),
+            '--server.headless', 'true', '--server.fileWatcherType', 'none',
+            '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + _STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'Streamlit did not start on port {port}')
+
+
+def _process_usage(pid):
+    """Return (CPU seconds, resident bytes) of a process, or (None, None) without /proc"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open(f'/proc/{pid}/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None, None
+    ticks = os.sysconf('SC_CLK_TCK')
+    # utime and stime are fields 14 and 15 of stat, i.e. 11 and 12 after the command name
+    return (int(fields[11]) + int(fields[12])) / ticks, pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def _percentiles(samples):
+    """Return the median, p95, p99 and maximum of latencies in milliseconds"""
+    samples = sorted(samples)
+    if not samples:
+        return {}
+
+    def at(q):
+        return samples[min(len(samples) - 1, int(len(samples) * q))]
+
+    return {
+        'median_ms': statistics.median(samples),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': samples[-1],
+    }
+
+
+async def _timed_run(ws, page_name):
+    """Ask the server to run the page script; return (milliseconds until it finished, error or None)
+
+    The error is the message of the first exception element the run sent,
+    or the finish status when it is not FINISHED_SUCCESSFULLY.
+    """
+    msg = BackMsg()
+    msg.rerun_script.page_name = page_name
+    msg.rerun_script.query_string = ''
+    start = time.perf_counter()
+    await ws.write_message(msg.SerializeToString(), binary=True)
+    error = None
+    while True:
+        raw = await asyncio.wait_for(ws.read_message(), _RUN_TIMEOUT)
+        if raw is None:
+            raise RuntimeError('Server closed the session')
+        forward = ForwardMsg()
+        forward.ParseFromString(raw)
+        kind = forward.WhichOneof('type')
+        if kind == 'delta' and error is None and forward.delta.new_element.WhichOneof('type') == 'exception':
+            exception = forward.delta.new_element.exception
+            error = f'{exception.type}: {exception.message}'
+        elif kind == 'script_finished':
+            if error is None and forward.script_finished != ForwardMsg.FINISHED_SUCCESSFULLY:
+                error = ForwardMsg.ScriptFinishedStatus.Name(forward.script_finished)
+            return (time.perf_counter() - start) * 1000, error
+
+
+async def _session(url, page_name, reruns, ready):
+    """Simulate one visitor: connect, wait for every session to connect, run the page reruns + 1 times"""
+    ws = await websocket_connect(url, max_message_size=_MAX_MESSAGE_SIZE)
+    try:
+        await ready.wait()
+        first = await _timed_run(ws, page_name)
+        return first, [await _timed_run(ws, page_name) for _ in range(reruns)]
+    finally:
+        ws.close()
+
+
+async def _run_level(port, page_name, sessions, reruns):
+    """Run sessions concurrent sessions of a page; return (first runs, reruns, wall seconds)
+
+    Each run is a (milliseconds, error or None) pair.
+    """
+    url = f'ws://127.0.0.1:{port}/_stcore/stream'
+    ready = asyncio.Event()
+    tasks = [asyncio.ensure_future(_session(url, page_name, reruns, ready)) for _ in range(sessions)]
+    # Let every session connect before any of them starts running
+    await asyncio.sleep(0.5)
+    start = time.perf_counter()
+    ready.set()
+    results = await asyncio.gather(*tasks)
+    wall = time.perf_counter() - start
+    return [first for first, _ in results], [sample for _, samples in results for sample in samples], wall
+
+
+def _measure(server, port, label, page_name, sessions, reruns):
+    """Load one page with sessions concurrent sessions and return the measurements"""
+    cpu_before, rss_before = _process_usage(server.pid)
+    first, rerun_samples, wall = asyncio.run(_run_level(port, page_name, sessions, reruns))
+    cpu_after, rss_after = _process_usage(server.pid)
+    errors = [error for _, error in first + rerun_samples if error]
+    return {
+        'script': label,
+        'sessions': sessions,
+        'reruns': reruns,
+        'first_run': _percentiles([ms for ms, error in first if not error]),
+        'rerun': _percentiles([ms for ms, error in rerun_samples if not error]),
+        # Failed runs are fast and would make a broken page look healthy
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'throughput_rps': (len(first) + len(rerun_samples) - len(errors)) / wall if wall else None,
+        'cpu_per_wall': (cpu_after - cpu_before) / wall if cpu_before is not None and wall else None,
+        'rss_before_mb': rss_before / 2**20 if rss_before is not None else None,
+        'rss_after_mb': rss_after / 2**20 if rss_after is not None else None,
+    }
+
+
+def run(sessions=(1, 5, 10, 25, 50), reruns=10, pages=_PAGES):
+    """Run the load test against a fresh server in each mode and return the results"""
+    results = []
+    for use_template in (True, False):
+        port = _free_port()
+        server = _start_server(use_template, port)
+        try:
+            for label, page_name in pages:
+                for count in sessions:
+                    result = _measure(server, port, label, page_name, count, reruns)
+                    result['mode'] = 'template' if use_template else 'static'
+                    results.append(result)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def _format_ms(percentiles, key):
+    """Internal function: Format a latency for the summary table ('-' when every run failed)"""
+    if key not in percentiles:
+        return f"{'-':>8}"
+    return f'{percentiles[key]:8.1f}'
+
+
+def _format_mb(before, after):
+    """Internal function: Format a memory change for the summary table"""
+    if before is None:
+        return '-'
+    return f'{before:.1f}->{after:.1f}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the site with concurrent simulated sessions')
+    parser.add_argument('--output', default='load.json', help='JSON file to write the results to')
+    parser.add_argument('--sessions', type=int, nargs='*', default=[1, 5, 10, 25, 50],
+                        help='numbers of concurrent sessions to simulate')
+    parser.add_argument('--reruns', type=int, default=10, help='reruns per session after its first run')
+    args = parser.parse_args()
+
+    results = run(sessions=args.sessions, reruns=args.reruns)
+    report = {
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'mode':8} {'script':13} {'N':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'runs/s':>7} {'errors':>6} {'cpu':>5}  rss MB")
+    for r in results:
+        cpu = f"{r['cpu_per_wall']:5.2f}" if r['cpu_per_wall'] is not None else '    -'
+        print(f"{r['mode']:8} {r['script']:13} {r['sessions']:4d} {_format_ms(r['rerun'], 'median_ms')} "
+              f"{_format_ms(r['rerun'], 'p95_ms')} {_format_ms(r['rerun'], 'p99_ms')} {r['throughput_rps']:7.1f} "
+              f"{r['errors']:6d} {cpu}  {_format_mb(r['rss_before_mb'], r['rss_after_mb'])}")
+    print(f'Results written to {args.output}')
+
+    failed = [r for r in results if r['errors']]
+    if failed:
+        for r in failed:
+            print(f"{r['mode']} {r['script']} N={r['sessions']}: {r['errors']} failed runs, e.g. {r['first_error']}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
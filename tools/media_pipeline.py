@@ -0,0 +1,147 @@
+"""Build streaming-friendly variants of the hero video
+
+Usage:
+    python tools/media_pipeline.py [--heights 1080 720 480] [--force]
+
+For every local video referenced by landing.hero.video.source (an
+app/static/... URL), writes H.264 variants with the moov atom at the
+front (faststart) for each height not larger than the source, plus a JPEG
+poster frame, to static/media/. static/media/manifest.json tells the
+landing template which files to offer. Requires ffmpeg and ffprobe.
+
+Streamlit's app/static handler already answers HTTP Range requests with
+206 Partial Content and validates ETags, so browsers fetch only the
+bytes they play once the moov atom is at the front of the file.
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# Make the project root importable when run via `python tools/media_pipeline.py`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
+
+from utils import helpers
+from utils.config_store import _write_atomic, read_config
+
+_MEDIA_DIR = os.path.join(helpers._STATIC_DIR, 'media')
+_MANIFEST_PATH = os.path.join(_MEDIA_DIR, 'manifest.json')
+
+# Constant rate factor per output height; smaller screens tolerate more compression
+_CRF = {1080: 23, 720: 24, 480: 26, 360: 28}
+
+
+def _local_path(url):
+    """Return the file behind an app/static/ URL, or None for remote URLs"""
+    prefix = helpers._STATIC_URL
+    if not url or not url.startswith(prefix):
+        return None
+    return os.path.join(helpers._STATIC_DIR, url[len(prefix):])
+
+
+def _probe(path):
+    """Return (width, height, duration in seconds) of the first video stream"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'stream=width,height:format=duration', '-of', 'json', path],
+        capture_output=True, text=True, check=True,
+    )
+    info = json.loads(result.stdout)
+    stream = info['streams'][0]
+    return stream['width'], stream['height'], float(info['format'].get('duration', 0))
+
+
+def _is_fresh(output, source):
+    """Return whether output exists and is newer than source"""
+    return os.path.exists(output) and os.path.getmtime(output) >= os.path.getmtime(source)
+
+
+def _encode(source, output, height):
+    """Write a muted, faststart H.264 copy of source scaled to the given height"""
+    tmp_path = f'{output}.tmp.mp4'
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-i', source,
+         '-vf', f'scale=-2:{height}', '-c:v', 'libx264', '-preset', 'slow',
+         '-crf', str(_CRF.get(height, 24)), '-pix_fmt', 'yuv420p',
+         '-an', '-movflags', '+faststart', tmp_path],
+        check=True,
+    )
+    os.replace(tmp_path, output)
+
+
+def _poster(source, output, duration):
+    """Write a JPEG frame from the start of source"""
+    tmp_path = f'{output}.tmp.jpg'
+    subprocess.run(
+        ['ffmpeg', '-y', '-v', 'error', '-ss', str(min(1.0, duration / 2)), '-i', source,
+         '-frames:v', '1', '-q:v', '3', tmp_path],
+        check=True,
+    )
+    os.replace(tmp_path, output)
+
+
+def process(url, heights, force=False):
+    """Build the variants and poster of one video; return its manifest entry"""
+    source = _local_path(url)
+    width, height, duration = _probe(source)
+    stem = os.path.splitext(os.path.basename(source))[0]
+    media_url = f'{helpers._STATIC_URL}media/'
+
+    # Never upscale; the largest variant is at most the source height
+    targets = sorted({h for h in heights if h < height} | {min(height, max(heights))}, reverse=True)
+    variants = []
+    for target in targets:
+        name = f'{stem}.{target}p.mp4'
+        output = os.path.join(_MEDIA_DIR, name)
+        if force or not _is_fresh(output, source):
+            print(f'Encoding {name}')
+            _encode(source, output, target)
+        variants.append({
+            'src': media_url + name,
+            'height': target,
+            'width': round(width * target / height / 2) * 2,
+            'bytes': os.path.getsize(output),
+        })
+
+    poster_name = f'{stem}.poster.jpg'
+    poster = os.path.join(_MEDIA_DIR, poster_name)
+    if force or not _is_fresh(poster, source):
+        _poster(source, poster, duration)
+
+    return {'poster': media_url + poster_name, 'variants': variants}
+
+
+def _video_sources():
+    """Return the local video URLs referenced by the landing config"""
+    video = read_config('landing').get('landing', {}).get('hero', {}).get('video', {})
+    source = video.get('source')
+    return [source] if _local_path(source) and os.path.exists(_local_path(source)) else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build faststart variants and a poster for the hero video')
+    parser.add_argument('--heights', type=int, nargs='*', default=[1080, 720, 480],
+                        help='variant heights in pixels')
+    parser.add_argument('--force', action='store_true', help='re-encode existing variants')
+    args = parser.parse_args()
+
+    if not (shutil.which('ffmpeg') and shutil.which('ffprobe')):
+        raise SystemExit('ffmpeg and ffprobe are required; install them and run again')
+
+    os.chdir(_ROOT)
+    os.makedirs(_MEDIA_DIR, exist_ok=True)
+    manifest = {url: process(url, args.heights, args.force) for url in _video_sources()}
+    # Renders read the manifest at any moment; never let them see half of it
+    _write_atomic(_MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+    for url, entry in manifest.items():
+        sizes = ', '.join(f"{v['height']}p {v['bytes'] // 1024} KB" for v in entry['variants'])
+        print(f'{url}: {sizes}')
+    print(f'Manifest written to {_MANIFEST_PATH}')
+
+
+if __name__ == '__main__':
+    main()
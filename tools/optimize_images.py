@@ -0,0 +1,103 @@
+"""Build responsive variants of the local images referenced by the configs
+
+Usage:
+    python tools/optimize_images.py [--widths 320 640 960 1280 1920] [--quality 80] [--force]
+
+Every app/static/... image URL found in template/config/*.yaml (logos,
+feature icons, the demo image, ...) is resized into WebP variants no
+wider than the original and written to static/img/. The real dimensions
+and a srcset of the variants are recorded in static/img/manifest.json,
+which the templates use to emit srcset, width/height and lazy loading.
+SVG files are vector images and are left untouched.
+"""
+import argparse
+import json
+import os
+import sys
+
+# Make the project root importable when run via `python tools/optimize_images.py`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
+
+from PIL import Image
+
+from utils import helpers
+from utils.config_store import _write_atomic, config_store, read_config
+
+_IMAGE_DIR = os.path.join(helpers._STATIC_DIR, 'img')
+_MANIFEST_PATH = os.path.join(_IMAGE_DIR, 'manifest.json')
+_RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif')
+
+
+def _image_urls(data):
+    """Yield every local raster image URL in a parsed config"""
+    if isinstance(data, str):
+        if data.startswith(helpers._STATIC_URL) and data.lower().endswith(_RASTER_EXTENSIONS):
+            yield data
+    elif hasattr(data, 'values'):
+        for value in data.values():
+            yield from _image_urls(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            yield from _image_urls(value)
+
+
+def _config_names():
+    """Return the names of the YAML files in the config directory"""
+    return sorted(
+        os.path.splitext(name)[0] for name in os.listdir(config_store.config_dir) if name.endswith('.yaml')
+    )
+
+
+def process(url, widths, quality, force=False):
+    """Write the WebP variants of one image; return its manifest entry"""
+    source = os.path.join(helpers._STATIC_DIR, url[len(helpers._STATIC_URL):])
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with Image.open(source) as image:
+        width, height = image.size
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+
+        srcset = []
+        for target in sorted({w for w in widths if w < width} | {width}):
+            name = f'{stem}.{target}w.webp'
+            output = os.path.join(_IMAGE_DIR, name)
+            if force or not os.path.exists(output) or os.path.getmtime(output) < os.path.getmtime(source):
+                resized = image.resize((target, round(height * target / width)), Image.LANCZOS)
+                resized.save(output, 'WEBP', quality=quality, method=6)
+            srcset.append(f'{helpers._STATIC_URL}img/{name} {target}w')
+
+    return {
+        'src': url,
+        'width': width,
+        'height': height,
+        'srcset': ', '.join(srcset),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build responsive WebP variants of the configured images')
+    parser.add_argument('--widths', type=int, nargs='*', default=[320, 640, 960, 1280, 1920],
+                        help='variant widths in pixels')
+    parser.add_argument('--quality', type=int, default=80, help='WebP quality (0-100)')
+    parser.add_argument('--force', action='store_true', help='rewrite existing variants')
+    args = parser.parse_args()
+
+    os.chdir(_ROOT)
+    os.makedirs(_IMAGE_DIR, exist_ok=True)
+    urls = sorted({url for name in _config_names() for url in _image_urls(read_config(name))})
+    manifest = {}
+    for url in urls:
+        if not os.path.exists(os.path.join(helpers._STATIC_DIR, url[len(helpers._STATIC_URL):])):
+            print(f'Skipping {url}: file not found')
+            continue
+        manifest[url] = process(url, args.widths, args.quality, args.force)
+        print(f"{url}: {manifest[url]['width']}x{manifest[url]['height']}")
+
+    # Renders read the manifest at any moment; never let them see half of it
+    _write_atomic(_MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    print(f'Manifest written to {_MANIFEST_PATH}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Vendor the CDN stylesheets and fonts used by styles.html into static/vendor/
+
+Usage:
+    python tools/vendor_assets.py [--offline]
+
+Downloads every stylesheet linked from template/*/styles.html and the
+fonts it references. Unmodified downloads are kept in static/vendor/src/,
+so --offline rebuilds the vendored files without network access. Icon
+rules of Bootstrap Icons and Font Awesome are reduced to the icons the
+rendered pages actually use, and the icon fonts are subset to those
+glyphs when fontTools is installed. Output files carry a content hash in
+their name and are listed in static/vendor/manifest.json. Set
+_USE_VENDORED_ASSETS = True in utils/helpers.py to serve them.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import urllib.request
+from io import BytesIO
+from urllib.parse import urljoin, urlsplit
+
+# Make the project root importable when run via `python tools/vendor_assets.py`
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(_ROOT)
+
+from utils import helpers
+from utils.config_store import _write_atomic
+from utils.minify import _css_blocks, _protect, _restore, _split_top_level
+
+# Optional dependency used to subset the icon fonts
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+_VENDOR_DIR = os.path.join(helpers._STATIC_DIR, 'vendor')
+_SOURCE_DIR = os.path.join(_VENDOR_DIR, 'src')
+_MANIFEST_PATH = os.path.join(_VENDOR_DIR, 'manifest.json')
+
+_STYLE_FILES = (
+    'template/template_version/styles.html',
+    'template/static_html_version/styles.html',
+)
+
+_LINK_RE = re.compile(r'<link\b[^>]*\bhref="(https?://[^"]+\.css)"[^>]*>', re.I)
+_URL_RE = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+_ICON_CLASS_RE = re.compile(r'\b((?:bi|fa)-[\w-]+)')
+_ICON_SELECTOR_RE = re.compile(r'^\.((?:bi|fa)-[\w-]+)::?before$')
+_CONTENT_RE = re.compile(r'content:\s*"\\([0-9a-fA-F]+)"')
+
+
+def _source_path(url):
+    """Return where the unmodified download of url is kept"""
+    name = os.path.basename(urlsplit(url).path) or 'index'
+    return os.path.join(_SOURCE_DIR, f'{hashlib.sha1(url.encode()).hexdigest()[:12]}-{name}')
+
+
+def _fetch(url, offline):
+    """Return the bytes of url, downloading it only if no local copy exists"""
+    path = _source_path(url)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    if offline:
+        raise SystemExit(f'Missing {path} for {url}; run once without --offline to download it')
+
+    print(f'Downloading {url}')
+    with urllib.request.urlopen(url, timeout=30) as response:
+        data = response.read()
+    os.makedirs(_SOURCE_DIR, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return data
+
+
+def _stylesheet_urls():
+    """Return the CDN stylesheets linked from the styles templates, in order"""
+    urls = []
+    for path in _STYLE_FILES:
+        with open(path, 'r', encoding='utf-8') as f:
+            for url in _LINK_RE.findall(f.read()):
+                if url not in urls:
+                    urls.append(url)
+    return urls
+
+
+def _used_icons():
+    """Return the icon classes (bi-*, fa-*) used by the rendered pages"""
+    pages = [helpers.render_template(name, config)[0] for name, config in helpers._PAGE_CONFIGS.items()]
+    static_dir = os.path.join(helpers._TEMPLATE_DIR, 'static_html_version')
+    for name in os.listdir(static_dir):
+        with open(os.path.join(static_dir, name), 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+    return set(_ICON_CLASS_RE.findall('\n'.join(pages)))
+
+
+def _subset_icon_rules(css, icons):
+    """Drop icon rules for unused icons; return the CSS and the codepoints of the kept icons"""
+    css, strings = _protect(css)
+    out, codepoints = [], set()
+    for prelude, body in _css_blocks(css):
+        if body is None:
+            out.append(prelude)
+            continue
+        names = [_ICON_SELECTOR_RE.match(s.strip()) for s in _split_top_level(prelude, ',')]
+        content = _CONTENT_RE.search(_restore(body, strings))
+        if content and all(names):
+            if not any(m.group(1) in icons for m in names):
+                continue
+            codepoints.add(int(content.group(1), 16))
+        out.append(f'{prelude}{{{body}}}')
+    return _restore(''.join(out), strings), codepoints
+
+
+def _subset_font(data, codepoints, url):
+    """Return the font reduced to the given codepoints, or unchanged if fontTools is unavailable"""
+    if font_subset is None or not codepoints:
+        return data
+    flavor = os.path.splitext(urlsplit(url).path)[1].lstrip('.')
+    options = font_subset.Options()
+    options.flavor = flavor if flavor in ('woff', 'woff2') else None
+    options.layout_features = ['*']
+    try:
+        font = font_subset.load_font(BytesIO(data), options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=codepoints)
+        subsetter.subset(font)
+        out = BytesIO()
+        font_subset.save_font(font, out, options)
+        return out.getvalue()
+    except Exception as e:  # e.g. brotli missing for woff2
+        print(f'Could not subset {url}: {e}; keeping the full font')
+        return data
+
+
+def _hashed_name(url, data):
+    """Return the file name of a vendored asset, with its content hash before the extension"""
+    stem, ext = os.path.splitext(os.path.basename(urlsplit(url).path))
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}'
+
+
+def _write(name, data):
+    """Write a vendored asset unless an identical one already exists"""
+    path = os.path.join(_VENDOR_DIR, name)
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def vendor(offline=False):
+    """Vendor every linked stylesheet and its fonts; return the manifest"""
+    os.makedirs(_VENDOR_DIR, exist_ok=True)
+    icons = _used_icons()
+    manifest = {'stylesheets': {}, 'files': {}, 'icons': sorted(icons)}
+
+    for css_url in _stylesheet_urls():
+        css = _fetch(css_url, offline).decode('utf-8')
+        css, codepoints = _subset_icon_rules(css, icons)
+
+        # Vendor the fonts and images the stylesheet refers to
+        replacements = {}
+        for _, ref in set(_URL_RE.findall(css)):
+            if ref.startswith('data:'):
+                continue
+            asset_url = urljoin(css_url, ref)
+            data = _subset_font(_fetch(asset_url, offline), codepoints, asset_url)
+            name = _hashed_name(asset_url, data)
+            _write(name, data)
+            replacements[ref] = name
+            manifest['files'][asset_url] = name
+        css = _URL_RE.sub(lambda m: f'url({m.group(1)}{replacements.get(m.group(2), m.group(2))}{m.group(1)})', css)
+
+        data = css.encode('utf-8')
+        name = _hashed_name(css_url, data)
+        _write(name, data)
+        manifest['stylesheets'][css_url] = name
+
+    # Remove vendored files of earlier runs
+    current = set(manifest['stylesheets'].values()) | set(manifest['files'].values())
+    for name in os.listdir(_VENDOR_DIR):
+        path = os.path.join(_VENDOR_DIR, name)
+        if os.path.isfile(path) and name != 'manifest.json' and name not in current:
+            os.remove(path)
+
+    # Written last and atomically, so renders see the old or the new manifest, never half of one
+    _write_atomic(_MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vendor the CDN stylesheets and fonts into static/vendor/')
+    parser.add_argument('--offline', action='store_true',
+                        help='use only the downloads already in static/vendor/src/')
+    args = parser.parse_args()
+
+    os.chdir(_ROOT)
+    if font_subset is None:
+        print('fontTools is not installed; icon fonts are vendored without subsetting')
+    manifest = vendor(offline=args.offline)
+    for url, name in manifest['stylesheets'].items():
+        print(f'{url} -> {name}')
+    print(f"{len(manifest['icons'])} icons kept, manifest written to {_MANIFEST_PATH}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Render the page templates into prebuilt, minified HTML
+
+Usage:
+    python -m utils.build [--force] [--no-minify]
+
+Each page in template/template_version/ is rendered with its YAML config
+into template/prebuilt_version/. A page is rebuilt only when the hash of
+its template source and config differs from the one in manifest.json.
+Stylesheets in static/css/ older than helpers._STYLESHEET_MAX_AGE are removed.
+Set _USE_PREBUILT = True in utils/helpers.py to serve the artifacts.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from utils import helpers
+from utils.minify import minify_html
+
+_MANIFEST_PATH = os.path.join(helpers._PREBUILT_DIR, 'manifest.json')
+
+
+def _load_manifest():
+    """Return the manifest of the previous build, or an empty one"""
+    try:
+        with open(_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_file(path, content):
+    """Write content to path, replacing the previous file atomically"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def build(force=False, minify=True):
+    """Rebuild the prebuilt pages whose inputs changed
+
+    Returns the names of the pages that were written.
+    """
+    os.makedirs(helpers._PREBUILT_DIR, exist_ok=True)
+    manifest = _load_manifest()
+    built = []
+
+    for file_name, config_name in helpers._PAGE_CONFIGS.items():
+        output_path = os.path.join(helpers._PREBUILT_DIR, f'{file_name}.html')
+        inputs = helpers._page_inputs(file_name, config_name)[2]
+        previous = manifest.get(file_name, {})
+        if (not force and previous.get('inputs') == inputs
+                and previous.get('minified') == minify and os.path.exists(output_path)):
+            continue
+
+        content, _ = helpers.render_template(file_name, config_name)
+        if minify:
+            content = minify_html(content)
+        _write_file(output_path, content)
+
+        manifest[file_name] = {
+            'inputs': inputs,
+            'minified': minify,
+            'output': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+            'bytes': len(content.encode('utf-8')),
+        }
+        built.append(file_name)
+
+    # The manifest is written last so a failed build never marks stale pages as fresh
+    _write_file(_MANIFEST_PATH, json.dumps(manifest, indent=2, sort_keys=True))
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prebuild the landing, footer and styles pages')
+    parser.add_argument('--force', action='store_true', help='rebuild every page')
+    parser.add_argument('--no-minify', action='store_true', help='write the rendered HTML unminified')
+    args = parser.parse_args()
+
+    built = build(force=args.force, minify=not args.no_minify)
+    for file_name in helpers._PAGE_CONFIGS:
+        status = 'built' if file_name in built else 'up to date'
+        print(f'{file_name}: {status}')
+    # Stylesheets of _LINK_STYLES are never removed while pages are served
+    for name in helpers.clean_stylesheets():
+        print(f'removed old stylesheet {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from types import MappingProxyType
+
+from utils import metrics
+from utils.models import ConfigError, load_model
+
+# Directory holding the YAML configuration files
+_CONFIG_DIR = 'template/config'
+
+_EMPTY = MappingProxyType({})
+
+_logger = logging.getLogger(__name__)
+
+
+def _load_yaml(raw, file_name):
+    """Internal function: Parse a YAML config into a dict, importing PyYAML on first use
+
+    Uses the libyaml-backed loader when PyYAML was built with it. Raises
+    ConfigError if the file is not valid YAML or its top level is not a
+    mapping; an empty file is {}.
+    """
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        data = yaml.load(raw, Loader=loader)
+    except yaml.YAMLError as e:
+        raise ConfigError(f'{file_name}: invalid YAML: {e}') from None
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ConfigError(f'{file_name}: expected a mapping at the top level, got {type(data).__name__}')
+    return data
+
+
+def _dump_yaml(data):
+    """Internal function: Serialize data to YAML bytes, keeping key order and non-ASCII text"""
+    import yaml
+    return yaml.dump(data, allow_unicode=True, sort_keys=False).encode('utf-8')
+
+
+def _write_atomic(path, raw):
+    """Internal function: Replace a file so readers see either the old or the new content
+
+    The data is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target.
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp creates the file as 0600; keep the permissions of the file being replaced
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    # Persist the rename itself; directories cannot be opened on Windows
+    try:
+        dir_fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def freeze(data):
+    """Return a read-only view of a parsed YAML object (dicts become mapping proxies, lists become tuples)"""
+    if isinstance(data, dict):
+        return MappingProxyType({key: freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(freeze(value) for value in data)
+    return data
+
+
+def thaw(data):
+    """Return a mutable deep copy of a frozen config, for callers that need to edit it"""
+    if isinstance(data, (dict, MappingProxyType)):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [thaw(value) for value in data]
+    return data
+
+
+class ConfigStore:
+    """Process-wide store of parsed YAML configuration files
+
+    Each file is parsed once and re-parsed only when stat() reports a new
+    mtime, size or inode. Callers receive read-only views of the cached data,
+    or its typed model from utils.models. A file that does not match its
+    model is still returned as data, so the editor can open and fix it,
+    while load() keeps returning the last model that was valid.
+    """
+
+    def __init__(self, config_dir=_CONFIG_DIR):
+        self.config_dir = config_dir
+        self.hits = 0
+        self.misses = 0
+        # Set while utils.watcher reports changes to config_dir; cached files are then not stat()ed
+        self.watched = False
+        self._entries = {}
+        # Last valid (model, content hash) of each file, kept across invalidations
+        self._good = {}
+        # Bumped by invalidate(), so a parse that raced with a change is not cached
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        """Return the file path of the named configuration"""
+        return os.path.join(self.config_dir, f'{name}.yaml')
+
+    def _entry(self, name):
+        """Internal function: Return (signature, data, digest, model, error), re-parsing the file if it changed
+
+        model is None and error is the ConfigError when the file does not match its model.
+        """
+        entry = self._entries.get(name)
+        if entry is not None and self.watched:
+            self.hits += 1
+            return entry
+
+        generation = self._generation
+        path = self.path(name)
+        try:
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            signature = None
+
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            return entry
+
+        if signature is None:
+            entry = (None, _EMPTY, hashlib.sha256(b'').hexdigest(), None, None)
+        else:
+            with metrics.stage('config_read', name) as timer:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                timer.nbytes = len(raw)
+            digest = hashlib.sha256(raw).hexdigest()
+            with metrics.stage('config_parse', name):
+                # Data that cannot be parsed is served as {}; a model mismatch keeps the data for the editor
+                data = _EMPTY
+                try:
+                    data = _load_yaml(raw, os.path.basename(path))
+                    model, error = load_model(name, data), None
+                except ConfigError as e:
+                    # Reported once per change of the file, not on every render
+                    _logger.error('%s', e)
+                    model, error = None, e
+            entry = (signature, freeze(data), digest, model, error)
+
+        with self._lock:
+            self.misses += 1
+            if generation == self._generation:
+                self._entries[name] = entry
+                if entry[3] is not None:
+                    self._good[name] = (entry[3], entry[2])
+        return entry
+
+    def get(self, name):
+        """Return a read-only view of the named configuration ({} if the file is missing)"""
+        return self._entry(name)[1]
+
+    def digest(self, name):
+        """Return the content hash of the named configuration file"""
+        return self._entry(name)[2]
+
+    def snapshot(self, name):
+        """Return (read-only view, content hash) of the named configuration with a single stat()"""
+        _, data, digest, _, _ = self._entry(name)
+        return data, digest
+
+    def load(self, name):
+        """Return (typed model, content hash) of the named configuration
+
+        The model is None when the file is missing or has no model. While the
+        file does not match its model, the last valid model and its hash are
+        returned; ConfigError is raised only if there has never been one.
+        """
+        _, _, digest, model, error = self._entry(name)
+        if error is not None:
+            good = self._good.get(name)
+            if good is None:
+                raise error
+            return good
+        return model, digest
+
+    def error(self, name):
+        """Return the ConfigError of the named configuration, or None if it is valid"""
+        return self._entry(name)[4]
+
+    def write(self, name, data):
+        """Save a configuration if it differs from the file on disk
+
+        Parameters:
+            name: Configuration name, e.g. 'landing'
+            data: Plain dicts and lists to serialize as YAML
+
+        Returns the content hash of the new file, which is the version the
+        render cache keys pages by, or None if nothing changed and the file
+        was left untouched. Raises ConfigError if data does not match the
+        model of the config.
+        """
+        if thaw(self.get(name)) == data:
+            return None
+        # Never write a file the site would refuse to load
+        load_model(name, data)
+        raw = _dump_yaml(data)
+        os.makedirs(self.config_dir, exist_ok=True)
+        _write_atomic(self.path(name), raw)
+        # The rename gives the file a new inode, so other processes re-parse it too
+        self.invalidate(name)
+        return hashlib.sha256(raw).hexdigest()
+
+    def invalidate(self, name=None):
+        """Forget one parsed file, or all of them when name is None"""
+        with self._lock:
+            self._generation += 1
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+    def stats(self):
+        """Return hit/miss counters and the number of parsed files"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+# Shared store used by the site and the configuration editor
+config_store = ConfigStore()
+
+
+def read_config(name):
+    """Return a read-only view of template/config/{name}.yaml"""
+    return config_store.get(name)
+
+
+def write_config(name, data):
+    """Save template/config/{name}.yaml atomically if it changed; return its new version or None"""
+    return config_store.write(name, data)
@@ -1,50 +1,810 @@
-import yaml
-from jinja2 import Template
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+from utils import metrics
+from utils.cache import LRUCache
+from utils.config_store import _write_atomic, config_store
+from utils.minify import extract_styles, optimize_page
+from utils.models import Model, load_model
+from utils.tenants import clear_tenants, tenant_stats
 
 # Set whether to use template mode (True for template, False for static HTML)
 _USE_TEMPLATE = True
 
+# LANDING_TEMPLATE_MODE=1 or 0 overrides the setting above for this process, e.g. for tools/load_test.py
+if os.environ.get('LANDING_TEMPLATE_MODE') in ('0', '1'):
+    _USE_TEMPLATE = os.environ['LANDING_TEMPLATE_MODE'] == '1'
+
 # Determine file path prefix based on mode
 _FILE_PREFIX = 'template_version' if _USE_TEMPLATE else 'static_html_version'
 
+# Set whether to serve the artifacts written by `python -m utils.build` (template mode only).
+# Pages whose template or config changed since the last build are rendered live instead.
+_USE_PREBUILT = False
+
+# Set whether to minify the assembled page and drop CSS rules its markup never uses
+_OPTIMIZE_PAYLOAD = True
+
+# Set whether to move the page CSS into a content-hashed file under _STATIC_DIR, which
+# browsers cache, so each rerun sends only markup and a <link> tag. Streamlit 1.40 serves
+# .css files from app/static as text/plain with nosniff, which browsers refuse to apply,
+# so point _STATIC_URL at a server that sends text/css before enabling this.
+_LINK_STYLES = False
+
+# Age in seconds after which clean_stylesheets() (run by `python -m utils.build`) removes a stylesheet
+_STYLESHEET_MAX_AGE = 7 * 24 * 3600
+
+# Set whether to replace the CDN stylesheet links with the copies written by
+# `python tools/vendor_assets.py`. They are inlined into the page so the
+# payload optimizations above apply to them, and their fonts are loaded
+# from _STATIC_URL.
+_USE_VENDORED_ASSETS = False
+
+# Directory served as static files, and the URL prefix it is served under
+_STATIC_DIR = 'static'
+_STATIC_URL = 'app/static/'
+
+# Manifests of generated assets, exposed to the templates under these names
+_ASSET_MANIFESTS = {
+    'media': os.path.join(_STATIC_DIR, 'media', 'manifest.json'),
+    'images': os.path.join(_STATIC_DIR, 'img', 'manifest.json'),
+}
+
+# Root directory of the HTML templates
+_TEMPLATE_DIR = 'template'
+
+# Directory of the Jinja templates, relative to _TEMPLATE_DIR
+_TEMPLATE_PREFIX = 'template_version'
+
+# Output directory of `python -m utils.build`
+_PREBUILT_DIR = 'template/prebuilt_version'
+
+# Maximum number of compiled templates kept in memory
+_TEMPLATE_CACHE_SIZE = 32
+
+_logger = logging.getLogger(__name__)
+
+# Shared Jinja environment, created on first use by _get_env()
+_jinja_env = None
+_jinja_env_lock = threading.Lock()
+
+# Maximum number of rendered pages kept in memory
+_RENDER_CACHE_SIZE = 64
+
+# Configuration file each page is rendered with
+_PAGE_CONFIGS = {
+    'styles': None,
+    'landing': 'landing',
+    'footer': 'auth',
+}
+
+# Pages laid out from partials in <_TEMPLATE_PREFIX>/sections/, in page order, with
+# the config subtree (a path of keys) each partial reads. Every partial is rendered
+# and cached on its own, so it must not read outside its subtree except for the
+# asset manifests. The page template receives the results as `sections`.
+_PAGE_SECTIONS = {
+    'landing': {
+        'integration': None,
+        'navbar': ('landing', 'navbar'),
+        'hero': ('landing', 'hero'),
+        'feature': ('landing', 'feature'),
+        'demo': ('landing', 'demo'),
+        'pricing': ('landing', 'pricing'),
+        'faq': ('landing', 'faq'),
+    },
+}
+
+# Set whether Home.py sends the landing page in chunks (template mode only): the styles,
+# navbar and hero first, then each section below the fold as soon as it is rendered, so
+# long pricing or FAQ lists no longer delay the first paint. Chunks are minified but their
+# CSS is not pruned, since the first chunk styles markup that has not been rendered yet.
+_PROGRESSIVE_RENDERING = False
+
+# Sections of each page sent in the first chunk; every other section is a chunk of its own
+_ABOVE_THE_FOLD = {
+    'landing': ('integration', 'navbar', 'hero'),
+}
+
+# Maximum number of rendered sections kept in memory
+_SECTION_CACHE_SIZE = 128
+
+# Process-wide cache of compiled templates, keyed by path and versioned by mtime
+_template_cache = LRUCache(_TEMPLATE_CACHE_SIZE)
+
+# Process-wide cache of rendered HTML, keyed by a hash of template source and config
+_render_cache = LRUCache(_RENDER_CACHE_SIZE)
+
+# Rendered sections, keyed by a hash of template source and the config subtree they read
+_section_cache = LRUCache(_SECTION_CACHE_SIZE)
+
+# Content hashes of config models; equal models hash alike, so a lookup skips serializing them
+_model_digests = LRUCache(_SECTION_CACHE_SIZE)
+
+# Most recent render cache key of each page, used for targeted invalidation
+_page_keys = {}
+
+# Contents of plain files served as-is, versioned by mtime
+_file_cache = LRUCache(_TEMPLATE_CACHE_SIZE)
+
+# (path, content hash) of asset manifests already reported as invalid
+_invalid_manifests = set()
+
+# Optimized pages, keyed by a hash of the assembled fragments
+_payload_cache = LRUCache(8)
+
+# Directories reported on by utils.watcher; files below them are not stat()ed
+# again until file_changed() says so, and their last known mtime (None for a
+# missing file) is kept here instead
+_watched_dirs = ()
+_known_mtimes = {}
+
+# Bumped by every file_changed(), so a stat() that raced with a change is not kept
+_file_generation = 0
+
+_UNKNOWN = object()
+
+# <link> tags pointing at a stylesheet, and relative url() references inside CSS
+_STYLESHEET_LINK_RE = re.compile(r'<link\b[^>]*\bhref="(https?://[^"]+\.css)"[^>]*>', re.I)
+_RELATIVE_URL_RE = re.compile(r'url\(\s*([\'"]?)(?!data:|https?:|/)([^\'")]+)\1\s*\)')
+
+# Byte counts of the most recent payload optimization
+_payload_stats = {}
+
+# Fragments of the page sent to the browser, in page order, as (file name, config name)
+_PAGE_FRAGMENTS = (('landing', 'landing'), ('footer', 'auth'), ('styles', None))
+
+# Maximum number of fragments loaded at the same time, shared by all sessions
+_FRAGMENT_WORKERS = 4
+
+# Thread pool loading fragments, created on first use by _get_fragment_pool()
+_fragment_pool = None
+_fragment_pool_lock = threading.Lock()
+
+# Seconds spent in each step of the first warm_up() call
+_warm_up_timings = {}
+_warm_up_lock = threading.Lock()
+
 # Load configuration file
 def load_config(config_file):
-    """Load the specified configuration file"""
+    """Load the specified configuration file
+
+    Returns a read-only view shared by all sessions; the file is parsed
+    again only when it changes on disk.
+    """
     if not _USE_TEMPLATE:
         return {}
-        
+
+    return config_store.get(config_file)
+
+def _digest(data):
+    """Internal function: Return a stable content hash of a string or config object"""
+    if isinstance(data, Model):
+        digest = _model_digests.get(data)
+        if digest is None:
+            digest = _digest(data.to_dict())
+            _model_digests.put(data, digest)
+        return digest
+    if not isinstance(data, str):
+        data = json.dumps(data, sort_keys=True, ensure_ascii=False, default=_plain)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+def config_digest(data):
+    """Return the content hash the caches use to key a config object"""
+    return _digest(data)
+
+def _plain(value):
+    """Internal function: JSON fallback for read-only config views and models"""
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+def _get_env():
+    """Internal function: Return the shared Jinja environment, importing jinja2 on first use
+
+    Jinja's own cache is disabled because compiled templates are kept in
+    _template_cache, which also checks file mtimes. Compiled bytecode is
+    persisted so a restarted server skips recompilation.
+    """
+    global _jinja_env
+    if _jinja_env is None:
+        with _jinja_env_lock:
+            if _jinja_env is None:
+                from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+                _jinja_env = Environment(
+                    loader=FileSystemLoader(_TEMPLATE_DIR),
+                    bytecode_cache=FileSystemBytecodeCache(),
+                    cache_size=0,
+                    auto_reload=False,
+                )
+    return _jinja_env
+
+def _get_template(template_name):
+    """Internal function: Return the compiled template and its source hash,
+    recompiling it when the file changes
+
+    Parameters:
+        template_name: Template path relative to the template directory
+    """
+    mtime = _mtime(os.path.join(_TEMPLATE_DIR, template_name))
+    entry = _template_cache.get(template_name, version=mtime)
+    if entry is None:
+        env = _get_env()
+        with metrics.stage('compile', template_name) as timer:
+            source, _, _ = env.loader.get_source(env, template_name)
+            entry = (env.get_template(template_name), _digest(source))
+            timer.nbytes = len(source)
+        _template_cache.put(template_name, entry, version=mtime)
+    return entry
+
+def template_cache_stats():
+    """Return hit/miss counters of the compiled-template cache"""
+    return _template_cache.stats()
+
+def render_cache_stats():
+    """Return hit/miss counters of the rendered-page cache"""
+    return _render_cache.stats()
+
+def cache_stats():
+    """Return hit/miss counters of every in-process cache"""
+    return {
+        'config': config_store.stats(),
+        'template': _template_cache.stats(),
+        'render': _render_cache.stats(),
+        'section': _section_cache.stats(),
+        'digest': _model_digests.stats(),
+        'file': _file_cache.stats(),
+        'payload': _payload_cache.stats(),
+        'tenant': tenant_stats(),
+    }
+
+def clear_caches():
+    """Forget every parsed config, compiled template and rendered page"""
+    config_store.invalidate()
+    _template_cache.clear()
+    _render_cache.clear()
+    _section_cache.clear()
+    _model_digests.clear()
+    _file_cache.clear()
+    _payload_cache.clear()
+    _page_keys.clear()
+    _known_mtimes.clear()
+    clear_tenants()
+
+def set_template_mode(use_template):
+    """Switch between template mode and static HTML mode at runtime"""
+    global _USE_TEMPLATE, _FILE_PREFIX
+    _USE_TEMPLATE = use_template
+    _FILE_PREFIX = 'template_version' if use_template else 'static_html_version'
+    clear_caches()
+
+def invalidate_config(config_name):
+    """Drop the parsed config and the rendered pages that depend on it"""
+    config_store.invalidate(config_name)
+    for file_name, page_config in _PAGE_CONFIGS.items():
+        if page_config == config_name and file_name in _page_keys:
+            _render_cache.discard(_page_keys.pop(file_name))
+
+def watched_dirs():
+    """Return the directories whose changes invalidate cached configs, templates and pages"""
+    return [
+        config_store.config_dir,
+        os.path.join(_TEMPLATE_DIR, 'template_version'),
+        os.path.join(_TEMPLATE_DIR, 'static_html_version'),
+        # Holds the asset manifests, which may not exist yet
+        _STATIC_DIR,
+    ]
+
+def watch_files(dirs):
+    """Trust cached file versions below dirs until file_changed() reports a change
+
+    Called by utils.watcher once it receives change events for dirs; pass
+    an empty list to go back to checking the disk on every lookup.
+    """
+    global _watched_dirs
+    _known_mtimes.clear()
+    _watched_dirs = tuple(os.path.normpath(path) + os.sep for path in dirs)
+    config_store.watched = config_store.config_dir in dirs
+
+def file_changed(path):
+    """Drop whatever was cached from a file that was modified, created or deleted"""
+    global _file_generation
+    path = os.path.normpath(path)
+    _file_generation += 1
+    _known_mtimes.pop(path, None)
+    directory, file_name = os.path.split(path)
+    if directory == os.path.normpath(config_store.config_dir) and file_name.endswith('.yaml'):
+        invalidate_config(file_name[:-len('.yaml')])
+
+def _mtime(path):
+    """Internal function: Return the mtime of a file, without a stat() while the watcher covers it"""
+    path = os.path.normpath(path)
+    if not path.startswith(_watched_dirs):
+        return os.stat(path).st_mtime_ns
+    mtime = _known_mtimes.get(path, _UNKNOWN)
+    if mtime is _UNKNOWN:
+        generation = _file_generation
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if generation == _file_generation:
+            _known_mtimes[path] = mtime
+    if mtime is None:
+        raise FileNotFoundError(path)
+    return mtime
+
+def _read_file(path):
+    """Internal function: Return the text of a file, re-reading it only when its mtime changes"""
+    mtime = _mtime(path)
+    content = _file_cache.get(path, version=mtime)
+    if content is None:
+        with metrics.stage('read', path) as timer:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            timer.nbytes = len(content)
+        _file_cache.put(path, content, version=mtime)
+    return content
+
+def _load_manifest(path, text):
+    """Internal function: Parse a JSON asset manifest; an invalid one is logged once and read as {}"""
     try:
-        with open(f'template/config/{config_file}.yaml', 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except FileNotFoundError:
+        return json.loads(text)
+    except ValueError as e:
+        key = (path, _digest(text))
+        if key not in _invalid_manifests:
+            _invalid_manifests.add(key)
+            _logger.warning('Ignoring invalid manifest %s: %s', path, e)
         return {}
 
-def _load_html_file(file_name, config_name=None):
+def _asset_context():
+    """Internal function: Return the asset manifests passed to every template, and their hash
+
+    media: output of tools/media_pipeline.py, keyed by video source URL
+    images: output of tools/optimize_images.py, keyed by image URL
+    """
+    context, digests = {}, []
+    for name, path in _ASSET_MANIFESTS.items():
+        try:
+            text = _read_file(path)
+        except FileNotFoundError:
+            text = '{}'
+        context[name] = _load_manifest(path, text)
+        digests.append(_digest(text))
+    return context, _digest(''.join(digests))
+
+def image_info(src):
+    """Return the manifest entry (width, height, srcset) of an optimized image, or None"""
+    return _asset_context()[0]['images'].get(src)
+
+def image_size(src):
+    """Return (width, height) of an image from the manifest, or read from its file under _STATIC_DIR
+
+    Returns None for remote images and files that are missing or cannot be read.
+    """
+    info = image_info(src)
+    if info:
+        return info['width'], info['height']
+    if not src.startswith(_STATIC_URL):
+        return None
+    # Pillow ships with Streamlit; imported on first use like the other optional modules
+    from PIL import Image, UnidentifiedImageError
+    try:
+        with Image.open(os.path.join(_STATIC_DIR, src[len(_STATIC_URL):])) as image:
+            return image.size
+    except (OSError, UnidentifiedImageError):
+        return None
+
+def _template_name(relative_name, tenant=None):
+    """Internal function: Return the loader name of a Jinja template, using the tenant's override if it has one"""
+    name = f'{_TEMPLATE_PREFIX}/{relative_name}'
+    return name if tenant is None else tenant.template_name(name)
+
+def _section_templates(file_name, tenant=None):
+    """Internal function: Return (section, template, source hash) for each partial of a sectioned page"""
+    return [
+        (section, *_get_template(_template_name(f'sections/{section}.html', tenant)))
+        for section in _PAGE_SECTIONS.get(file_name, ())
+    ]
+
+def _page_inputs(file_name, config_name, tenant=None):
+    """Internal function: Return (template, render context, input hash) of a page template"""
+    store = config_store if tenant is None else tenant
+    config, config_digest = store.load(config_name) if config_name else (None, '')
+    assets, assets_digest = _asset_context()
+    template, source_digest = _get_template(_template_name(f'{file_name}.html', tenant))
+    source_digest += ''.join(digest for _, _, digest in _section_templates(file_name, tenant))
+    return template, {**(config or {}), **assets}, _digest(source_digest + config_digest + assets_digest)
+
+def _subtree(config, path):
+    """Internal function: Return the part of a config found at a path of keys, or None"""
+    if path is None:
+        return None
+    for key in path:
+        if not isinstance(config, (Mapping, Model)) or key not in config:
+            return None
+        config = config[key]
+    return config
+
+def _render_section(key, target, render):
+    """Internal function: Return (html, rendered) for a section, calling render() only on a cache miss"""
+    content = _section_cache.get(key)
+    if content is not None:
+        return content, False
+    with metrics.stage('render', target) as timer:
+        content = render()
+        timer.nbytes = len(content)
+    _section_cache.put(key, content)
+    return content, True
+
+def _render_sections(file_name, context, tenant=None):
+    """Internal function: Render the partials of a sectioned page, reusing every cached section
+
+    Sections are shared by all tenants, since their keys cover the partial
+    source. Returns a dict of section name to HTML and the names of the
+    sections that had to be rendered.
+    """
+    assets_digest = _asset_context()[1]
+    sections, rendered = {}, []
+    for section, template, source_digest in _section_templates(file_name, tenant):
+        sections[section], fresh = _page_section(file_name, context, section, template, source_digest, assets_digest)
+        if fresh:
+            rendered.append(section)
+    return sections, rendered
+
+def _page_section(file_name, context, section, template, source_digest, assets_digest):
+    """Internal function: Return (html, rendered) for one partial, keyed by its source and config subtree"""
+    subtree = _subtree(context, _PAGE_SECTIONS[file_name][section])
+    key = _digest(source_digest + _digest(subtree) + assets_digest)
+    return _render_section(key, f'{file_name}#{section}', lambda: template.render(**context))
+
+def render_template(file_name, config_name=None, tenant=None):
+    """Render a page template with its configuration file
+
+    Parameters:
+        file_name: File name without path and extension
+        config_name: Configuration file name
+        tenant: Tenant whose configs and templates to use (None for the default site)
+
+    Returns the HTML and a hash of the inputs it was rendered from.
+    """
+    template, config, key = _page_inputs(file_name, config_name, tenant)
+
+    # Identical template source and config always render identical HTML
+    if tenant is None:
+        cache = _render_cache
+        _page_keys[file_name] = key
+    else:
+        cache = tenant.render_cache
+    content = cache.get(key)
+    if content is None:
+        with metrics.stage('render', file_name) as timer:
+            if file_name in _PAGE_SECTIONS:
+                # Sections whose config subtree did not change are reused byte for byte
+                content = template.render(sections=_render_sections(file_name, config, tenant)[0])
+            else:
+                content = template.render(**config)
+            timer.nbytes = len(content)
+        cache.put(key, content)
+    return content, key
+
+def _load_prebuilt(file_name, config_name):
+    """Internal function: Return the prebuilt page, or None if it is missing or out of date"""
+    try:
+        manifest = json.loads(_read_file(os.path.join(_PREBUILT_DIR, 'manifest.json')))
+        entry = manifest.get(file_name)
+        if entry is None or entry['inputs'] != _page_inputs(file_name, config_name)[2]:
+            return None
+        return _read_file(os.path.join(_PREBUILT_DIR, f'{file_name}.html'))
+    except FileNotFoundError:
+        return None
+
+def _load_html_file(file_name, config_name=None, tenant=None):
     """Internal function: Load HTML file based on current mode
-    
+
     Parameters:
         file_name: File name without path and extension
         config_name: Configuration file name (used only in template mode)
+        tenant: Tenant to render for (template mode only; None for the default site)
     """
-    file_path = f'template/{_FILE_PREFIX}/{file_name}.html'
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-        
-    if not _USE_TEMPLATE:
+    with metrics.stage('page', file_name) as timer:
+        content = None
+        if not _USE_TEMPLATE:
+            content = _read_file(f'template/{_FILE_PREFIX}/{file_name}.html')
+        elif _USE_PREBUILT and tenant is None:
+            content = _load_prebuilt(file_name, config_name)
+        if content is None:
+            content = render_template(file_name, config_name, tenant)[0]
+        timer.nbytes = len(content)
+    return content
+
+def payload_stats():
+    """Return the byte counts before and after the most recent payload optimization"""
+    return dict(_payload_stats)
+
+def _write_stylesheet(css):
+    """Internal function: Write css to a content-hashed file under _STATIC_DIR and return its URL
+
+    Earlier stylesheets are left in place, since cached pages (of other
+    tenants, or the editor preview) may still link to them; remove old ones
+    with clean_stylesheets().
+    """
+    digest = _digest(css)[:12]
+    css_dir = os.path.join(_STATIC_DIR, 'css')
+    file_name = f'styles.{digest}.css'
+    path = os.path.join(css_dir, file_name)
+    if not os.path.exists(path):
+        os.makedirs(css_dir, exist_ok=True)
+        # A unique temporary file, so concurrent sessions writing the same stylesheet do not collide
+        _write_atomic(path, css.encode('utf-8'))
+    # The version query makes Tornado's static handler send long-lived cache headers
+    return f'{_STATIC_URL}css/{file_name}?v={digest}'
+
+def clean_stylesheets(max_age=_STYLESHEET_MAX_AGE):
+    """Remove stylesheets written by _LINK_STYLES that are older than max_age seconds; return their names
+
+    Called from the build step rather than on render, so no page that is
+    still cached loses its stylesheet.
+    """
+    css_dir = os.path.join(_STATIC_DIR, 'css')
+    try:
+        names = os.listdir(css_dir)
+    except FileNotFoundError:
+        return []
+    cutoff = time.time() - max_age
+    removed = []
+    for name in names:
+        path = os.path.join(css_dir, name)
+        if not (name.startswith('styles.') and name.endswith('.css')):
+            continue
+        try:
+            if os.stat(path).st_mtime < cutoff:
+                os.remove(path)
+                removed.append(name)
+        except FileNotFoundError:
+            pass
+    return removed
+
+def _vendor_manifest():
+    """Internal function: Return the vendored asset manifest and its hash, or (None, '') if there is none"""
+    path = os.path.join(_STATIC_DIR, 'vendor', 'manifest.json')
+    try:
+        text = _read_file(path)
+    except FileNotFoundError:
+        return None, ''
+    # An invalid manifest vendors nothing: the CDN links are kept
+    return _load_manifest(path, text) or None, _digest(text)
+
+def _inline_vendored_styles(page, manifest):
+    """Internal function: Replace CDN stylesheet links with the vendored CSS
+
+    Font and icon URLs are made root-relative, so they also resolve once
+    _LINK_STYLES moves the CSS into a file under static/css/.
+    """
+    static_url = _STATIC_URL if _STATIC_URL.startswith('/') or '://' in _STATIC_URL else f'/{_STATIC_URL}'
+    vendor_url = f'{static_url}vendor/'
+
+    def inline(match):
+        name = manifest.get('stylesheets', {}).get(match.group(1))
+        if name is None:
+            return match.group(0)
+        css = _read_file(os.path.join(_STATIC_DIR, 'vendor', name))
+        css = _RELATIVE_URL_RE.sub(lambda m: f'url({m.group(1)}{vendor_url}{m.group(2)}{m.group(1)})', css)
+        return f'<style>{css}</style>'
+
+    return _STYLESHEET_LINK_RE.sub(inline, page)
+
+def _build_payload(page, manifest=None, prune=True):
+    """Internal function: Apply the payload optimizations enabled by the module flags"""
+    if manifest:
+        page = _inline_vendored_styles(page, manifest)
+    if _OPTIMIZE_PAYLOAD:
+        with metrics.stage('optimize', 'page') as timer:
+            page, stats = optimize_page(page, prune)
+            timer.nbytes = stats['before']
+        _payload_stats.update(stats)
+        _logger.info('Page payload optimized from %d to %d bytes', stats['before'], stats['after'])
+    if _LINK_STYLES:
+        page, css = extract_styles(page)
+        if css:
+            page = f'<link rel="stylesheet" href="{_write_stylesheet(css)}">{page}'
+    return page
+
+def _assemble_page(landing, footer, style, cache=_payload_cache):
+    """Internal function: Join the page fragments and apply the payload optimizations, caching the result"""
+    page = f"""
+{landing}
+{footer}
+{style}
+"""
+    manifest, manifest_digest = _vendor_manifest() if _USE_VENDORED_ASSETS else (None, '')
+    if not (_OPTIMIZE_PAYLOAD or _LINK_STYLES or manifest):
+        return page
+
+    key = _digest(page + manifest_digest)
+    payload = cache.get(key)
+    if payload is None:
+        payload = _build_payload(page, manifest)
+        cache.put(key, payload)
+    return payload
+
+def load_page(tenant=None):
+    """Assemble the landing page, footer and styles into the payload sent to the browser
+
+    With _USE_VENDORED_ASSETS the CDN stylesheets are inlined from
+    static/vendor/; with _OPTIMIZE_PAYLOAD the result is minified and
+    stripped of unused CSS rules; with _LINK_STYLES the CSS is sent as a
+    cached stylesheet file instead. The result is cached until any
+    fragment or the vendor manifest changes.
+
+    Parameters:
+        tenant: Tenant returned by utils.tenants.resolve_tenant() (None for the default site)
+    """
+    cache = _payload_cache if tenant is None else tenant.render_cache
+    landing, footer, style = load_fragments(_PAGE_FRAGMENTS, tenant)
+    return _assemble_page(landing, footer, style, cache)
+
+def _build_chunk(content, cache):
+    """Internal function: Apply the payload optimizations to one chunk of a page, caching the result"""
+    manifest, manifest_digest = _vendor_manifest() if _USE_VENDORED_ASSETS else (None, '')
+    if not (_OPTIMIZE_PAYLOAD or _LINK_STYLES or manifest):
         return content
-    else:
-        config = load_config(config_name) if config_name else {}
-        template = Template(content)
-        return template.render(**config)
 
-# Basic loading functions
-def load_style():
-    return _load_html_file('styles')
+    key = _digest('chunk' + content + manifest_digest)
+    payload = cache.get(key)
+    if payload is None:
+        payload = _build_payload(content, manifest, prune=False)
+        cache.put(key, payload)
+    return payload
+
+def load_page_chunks(tenant=None):
+    """Yield the payload sent to the browser in the chunks Home.py sends one after another
+
+    With _PROGRESSIVE_RENDERING (template mode only), the first chunk holds
+    the styles and the sections in _ABOVE_THE_FOLD, and each later section
+    is rendered only when the previous chunk has been consumed; the footer
+    comes with the last one. Otherwise the whole load_page() payload is the
+    only chunk.
+
+    Parameters:
+        tenant: Tenant returned by utils.tenants.resolve_tenant() (None for the default site)
+    """
+    if not (_PROGRESSIVE_RENDERING and _USE_TEMPLATE):
+        yield load_page(tenant)
+        return
+
+    cache = _payload_cache if tenant is None else tenant.render_cache
+    _, context, _ = _page_inputs('landing', 'landing', tenant)
+    assets_digest = _asset_context()[1]
+    above, below = [], []
+    for entry in _section_templates('landing', tenant):
+        (above if entry[0] in _ABOVE_THE_FOLD['landing'] else below).append(entry)
+
+    def render(entries):
+        return '\n'.join(_page_section('landing', context, *entry, assets_digest)[0] for entry in entries)
+
+    # Styles come first, so every later chunk is painted already styled
+    yield _build_chunk(f'{load_style(tenant)}\n{render(above)}', cache)
+    for i, entry in enumerate(below):
+        content = render([entry])
+        if i == len(below) - 1:
+            content = f'{content}\n{load_footer(tenant)}'
+        yield _build_chunk(content, cache)
 
-def load_landing_page():
-    return _load_html_file('landing', 'landing')
+def render_preview(landing_config, auth_config):
+    """Render the page from unsaved configs, re-rendering only the sections whose config changed
+
+    Parameters:
+        landing_config: Contents of landing.yaml, e.g. as edited in the config editor
+        auth_config: Contents of auth.yaml
+
+    Raises ConfigError if either config does not match its model.
+
+    Sections of the landing page share the cache of the live site, keyed by
+    the config subtree they read, and the footer is cached by a hash of
+    auth_config. Returns the payload as load_page() would build it and the
+    names of the sections that had to be rendered.
+    """
+    if not _USE_TEMPLATE:
+        return load_page(), []
+
+    landing_config, auth_config = load_model('landing', landing_config), load_model('auth', auth_config)
+    assets, assets_digest = _asset_context()
+    template, _ = _get_template(f'{_TEMPLATE_PREFIX}/landing.html')
+    sections, rendered = _render_sections('landing', {**landing_config, **assets})
+
+    footer_template, footer_digest = _get_template(f'{_TEMPLATE_PREFIX}/footer.html')
+    footer, fresh = _render_section(
+        _digest(footer_digest + _digest(auth_config) + assets_digest), 'footer',
+        lambda: footer_template.render(**auth_config, **assets),
+    )
+    if fresh:
+        rendered.append('footer')
+
+    return _assemble_page(template.render(sections=sections), footer, load_style()), rendered
+
+def warm_up():
+    """Import the template dependencies, parse the configs and build every page once
+
+    Meant to run before the first visitor is served. Only the first call
+    does any work; it logs and returns the seconds spent on each step.
+    """
+    with _warm_up_lock:
+        if _warm_up_timings:
+            return dict(_warm_up_timings)
+
+        timings = {}
+
+        def timed(step, func, *args):
+            start = time.perf_counter()
+            func(*args)
+            timings[step] = time.perf_counter() - start
+
+        if not _USE_TEMPLATE:
+            for file_name in _PAGE_CONFIGS:
+                timed(f'read {file_name}', _read_file, f'template/{_FILE_PREFIX}/{file_name}.html')
+        else:
+            timed('import jinja2', _get_env)
+            timed('import yaml', __import__, 'yaml')
+            for config_name in filter(None, _PAGE_CONFIGS.values()):
+                timed(f'parse {config_name}', config_store.snapshot, config_name)
+            for file_name in _PAGE_CONFIGS:
+                timed(f'compile {file_name}', _get_template, f'{_TEMPLATE_PREFIX}/{file_name}.html')
+            for file_name, config_name in _PAGE_CONFIGS.items():
+                timed(f'render {file_name}', _load_html_file, file_name, config_name)
+        timed('assemble page', load_page)
+
+        _warm_up_timings.update(timings)
+        _logger.info(
+            'Warm-up finished in %.1f ms: %s',
+            sum(timings.values()) * 1000,
+            ', '.join(f'{step} {seconds * 1000:.1f} ms' for step, seconds in timings.items()),
+        )
+        return dict(timings)
+
+def _get_fragment_pool():
+    """Internal function: Return the shared fragment thread pool, starting it on first use"""
+    global _fragment_pool
+    if _fragment_pool is None:
+        with _fragment_pool_lock:
+            if _fragment_pool is None:
+                _fragment_pool = ThreadPoolExecutor(_FRAGMENT_WORKERS, thread_name_prefix='fragment')
+    return _fragment_pool
+
+def load_fragments(specs, tenant=None):
+    """Load several page fragments concurrently and return their HTML in the order given
+
+    Each fragment reads its files, parses its config and renders on the
+    shared, bounded thread pool, so a cold page costs about as much as its
+    slowest fragment. The first error raised by a fragment is re-raised.
+
+    Parameters:
+        specs: (file name, config name) pairs, e.g. [('landing', 'landing'), ('styles', None)]
+        tenant: Tenant to render for (None for the default site)
+    """
+    specs = list(specs)
+    if len(specs) < 2:
+        return [_load_html_file(file_name, config_name, tenant) for file_name, config_name in specs]
+    pool = _get_fragment_pool()
+    futures = [
+        pool.submit(_load_html_file, file_name, config_name, tenant) for file_name, config_name in specs
+    ]
+    return [future.result() for future in futures]
+
+# Basic loading functions
+def load_style(tenant=None):
+    return _load_html_file('styles', tenant=tenant)
 
-def load_footer():
-    return _load_html_file('footer', 'auth')
+def load_landing_page(tenant=None):
+    return _load_html_file('landing', 'landing', tenant)
 
+def load_footer(tenant=None):
+    return _load_html_file('footer', 'auth', tenant)
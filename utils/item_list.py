@@ -0,0 +1,111 @@
+import itertools
+
+
+class ItemList:
+    """Ordered collection of items addressed by stable ids
+
+    Items are kept in a doubly linked list indexed by id, so inserting,
+    deleting and moving an item are O(1) wherever it sits. Ids are never
+    reused, which makes them safe to embed in widget keys.
+    """
+
+    def __init__(self, values=()):
+        self._values = {}
+        self._prev = {}
+        self._next = {}
+        self.head = None
+        self.tail = None
+        self._ids = itertools.count()
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, item_id):
+        return item_id in self._values
+
+    def __getitem__(self, item_id):
+        return self._values[item_id]
+
+    def __setitem__(self, item_id, value):
+        if item_id not in self._values:
+            raise KeyError(item_id)
+        self._values[item_id] = value
+
+    def __iter__(self):
+        """Yield (id, value) pairs in list order"""
+        item_id = self.head
+        while item_id is not None:
+            yield item_id, self._values[item_id]
+            item_id = self._next[item_id]
+
+    def values(self):
+        """Return the values as a plain list, in list order"""
+        return [value for _, value in self]
+
+    def page(self, start, count):
+        """Return up to count (id, value) pairs starting at position start"""
+        return list(itertools.islice(self, start, start + count))
+
+    def _link(self, item_id, prev_id, next_id):
+        """Internal function: Place an unlinked id between two neighbours"""
+        self._prev[item_id] = prev_id
+        self._next[item_id] = next_id
+        if prev_id is None:
+            self.head = item_id
+        else:
+            self._next[prev_id] = item_id
+        if next_id is None:
+            self.tail = item_id
+        else:
+            self._prev[next_id] = item_id
+
+    def _unlink(self, item_id):
+        """Internal function: Take an id out of the chain, joining its neighbours"""
+        prev_id, next_id = self._prev.pop(item_id), self._next.pop(item_id)
+        if prev_id is None:
+            self.head = next_id
+        else:
+            self._next[prev_id] = next_id
+        if next_id is None:
+            self.tail = prev_id
+        else:
+            self._prev[next_id] = prev_id
+
+    def append(self, value):
+        """Add a value at the end; return its id"""
+        return self.insert_after(self.tail, value)
+
+    def insert_after(self, ref_id, value):
+        """Add a value after ref_id (at the front when ref_id is None); return its id"""
+        item_id = next(self._ids)
+        self._values[item_id] = value
+        next_id = self.head if ref_id is None else self._next[ref_id]
+        self._link(item_id, ref_id, next_id)
+        return item_id
+
+    def remove(self, item_id):
+        """Delete an item; return its value"""
+        self._unlink(item_id)
+        return self._values.pop(item_id)
+
+    def move_after(self, item_id, ref_id):
+        """Move an item after ref_id (to the front when ref_id is None)"""
+        if item_id == ref_id:
+            return
+        self._unlink(item_id)
+        next_id = self.head if ref_id is None else self._next[ref_id]
+        self._link(item_id, ref_id, next_id)
+
+    def move_up(self, item_id):
+        """Swap an item with the one before it"""
+        prev_id = self._prev[item_id]
+        if prev_id is not None:
+            self.move_after(item_id, self._prev[prev_id])
+
+    def move_down(self, item_id):
+        """Swap an item with the one after it"""
+        next_id = self._next[item_id]
+        if next_id is not None:
+            self.move_after(item_id, next_id)
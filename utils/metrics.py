@@ -0,0 +1,181 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Set whether to record per-stage timings of page builds (opt-in, or set LANDING_METRICS=1)
+_ENABLED = os.environ.get('LANDING_METRICS') == '1'
+
+# File written by export_prometheus(); set by the operator, never by a visitor
+_EXPORT_PATH = os.environ.get('LANDING_METRICS_FILE', 'metrics.prom')
+
+# Number of recent samples per stage used for the percentiles
+_WINDOW = 1024
+
+_QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _Series:
+    """Recent durations and running totals of one (stage, target) pair"""
+
+    __slots__ = ('samples', 'count', 'seconds', 'bytes')
+
+    def __init__(self):
+        self.samples = deque(maxlen=_WINDOW)
+        self.count = 0
+        self.seconds = 0.0
+        self.bytes = 0
+
+
+class _Timer:
+    """Context manager that records the time spent in its block"""
+
+    __slots__ = ('recorder', 'stage', 'target', 'nbytes', 'start')
+
+    def __init__(self, recorder, stage, target):
+        self.recorder = recorder
+        self.stage = stage
+        self.target = target
+        self.nbytes = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.stage, time.perf_counter() - self.start, self.nbytes, self.target)
+
+
+class _NullTimer:
+    """Stand-in for _Timer used while instrumentation is disabled"""
+
+    nbytes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Recorder:
+    """Thread-safe store of per-stage timings and byte counts"""
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, nbytes=0, target=None):
+        """Add one sample for a stage"""
+        with self._lock:
+            series = self._series.get((stage, target))
+            if series is None:
+                series = self._series[(stage, target)] = _Series()
+            series.samples.append(seconds)
+            series.count += 1
+            series.seconds += seconds
+            series.bytes += nbytes or 0
+
+    def reset(self):
+        """Drop all samples"""
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """Return one row per (stage, target) with counts, byte totals and p50/p95/p99 in milliseconds"""
+        with self._lock:
+            items = [(key, sorted(s.samples), s.count, s.seconds, s.bytes) for key, s in self._series.items()]
+
+        rows = []
+        for (stage, target), samples, count, seconds, nbytes in sorted(items, key=lambda i: (i[0][0], i[0][1] or '')):
+            row = {'stage': stage, 'target': target, 'count': count, 'total_ms': seconds * 1000, 'bytes': nbytes}
+            for q in _QUANTILES:
+                row[f'p{int(q * 100)}_ms'] = samples[min(len(samples) - 1, int(len(samples) * q))] * 1000
+            rows.append(row)
+        return rows
+
+
+recorder = Recorder()
+
+
+def enabled():
+    """Return whether instrumentation is switched on"""
+    return _ENABLED
+
+
+def enable(flag=True):
+    """Switch instrumentation on or off at runtime"""
+    global _ENABLED
+    _ENABLED = flag
+
+
+def stage(name, target=None):
+    """Time a block as one sample of a stage; does nothing unless instrumentation is enabled
+
+    Parameters:
+        name: Stage name, e.g. 'render'
+        target: Page or config the sample belongs to
+
+    Set the `nbytes` attribute of the returned object to record a byte count.
+    """
+    if not _ENABLED:
+        return _NULL_TIMER
+    return _Timer(recorder, name, target)
+
+
+def _labels(**labels):
+    """Internal function: Format Prometheus labels, skipping empty values"""
+    return ','.join(f'{key}="{value}"' for key, value in labels.items() if value is not None)
+
+
+def prometheus_text(cache_stats=None):
+    """Return the recorded metrics in the Prometheus text exposition format
+
+    Parameters:
+        cache_stats: Optional mapping of cache name to a dict with 'hits' and 'misses'
+    """
+    lines = [
+        '# HELP landing_stage_seconds Time spent in each stage of a page build',
+        '# TYPE landing_stage_seconds summary',
+    ]
+    rows = recorder.snapshot()
+    for row in rows:
+        labels = _labels(stage=row['stage'], target=row['target'])
+        for q in _QUANTILES:
+            value = row[f'p{int(q * 100)}_ms'] / 1000
+            lines.append(f'landing_stage_seconds{{{labels},quantile="{q}"}} {value:.9f}')
+        lines.append(f'landing_stage_seconds_sum{{{labels}}} {row["total_ms"] / 1000:.9f}')
+        lines.append(f'landing_stage_seconds_count{{{labels}}} {row["count"]}')
+
+    lines += [
+        '# HELP landing_stage_bytes_total Bytes processed by each stage of a page build',
+        '# TYPE landing_stage_bytes_total counter',
+    ]
+    for row in rows:
+        lines.append(f'landing_stage_bytes_total{{{_labels(stage=row["stage"], target=row["target"])}}} {row["bytes"]}')
+
+    if cache_stats:
+        for kind in ('hits', 'misses'):
+            lines += [
+                f'# HELP landing_cache_{kind}_total Cache {kind} per cache',
+                f'# TYPE landing_cache_{kind}_total counter',
+            ]
+            for name, stats in cache_stats.items():
+                lines.append(f'landing_cache_{kind}_total{{cache="{name}"}} {stats[kind]}')
+    return '\n'.join(lines) + '\n'
+
+
+def export_path():
+    """Return the file export_prometheus() writes (LANDING_METRICS_FILE, or metrics.prom)"""
+    return _EXPORT_PATH
+
+
+def export_prometheus(path=None, cache_stats=None):
+    """Write prometheus_text() to a local file (export_path() by default), replacing it atomically"""
+    # Imported here: config_store records its parse timings through this module
+    from utils.config_store import _write_atomic
+    # A unique temporary file, so sessions exporting at the same time do not collide
+    _write_atomic(path or _EXPORT_PATH, prometheus_text(cache_stats).encode('utf-8'))
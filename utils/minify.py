@@ -0,0 +1,228 @@
+import re
+
+# Quoted strings and unquoted url() values are protected from whitespace rewriting
+_STRING_RE = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|\burl\(\s*[^\s"\')][^)]*\)', re.I)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s*([{};,>])\s*')
+_HTML_COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_STYLE_RE = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.S | re.I)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Statements browsers honour only at the top of a stylesheet
+_CSS_HEAD_RE = re.compile(r'@(charset|import)\b[^;{}]*;\s*', re.I)
+
+# Whitespace next to these tags never affects layout
+_BLOCK_TAGS = (
+    'html|head|body|meta|link|style|script|nav|section|footer|header|main|div|'
+    'ul|ol|li|p|h1|h2|h3|h4|h5|h6|details|summary|video|source|br'
+)
+_BLOCK_SPACE_RE = re.compile(rf'\s*(</?(?:{_BLOCK_TAGS})\b[^>]*>)\s*', re.I)
+
+# Markup tokens used to decide which CSS rules can match
+_CLASS_ATTR_RE = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']', re.I)
+_ID_ATTR_RE = re.compile(r'\bid\s*=\s*["\']([^"\']*)["\']', re.I)
+_TAG_RE = re.compile(r'<([a-zA-Z][\w-]*)')
+_SCRIPT_CLASS_RE = re.compile(r'classList\.(?:add|toggle|replace)\(([^)]*)\)')
+_SCRIPT_STRING_RE = re.compile(r'[\'"]([\w-]+)[\'"]')
+
+# Selector parts that never need to be present in the markup
+_SELECTOR_IGNORE_RE = re.compile(r'\[[^\]]*\]|::?[\w-]+\([^)]*\)|::?[\w-]+')
+_SELECTOR_CLASS_RE = re.compile(r'\.([\w-]+)')
+_SELECTOR_ID_RE = re.compile(r'#([\w-]+)')
+_SELECTOR_TAG_RE = re.compile(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)')
+
+# Elements and classes of the Streamlit page the fragments are injected into
+_HOST_TAGS = {'html', 'body', 'header', 'main', 'iframe'}
+_HOST_CLASSES = {'block-container', 'main', 'stApp'}
+
+# State classes that scripts outside the fragment (Bootstrap, scroll handlers) add at runtime
+_STATE_CLASSES = {'active', 'collapsed', 'collapsing', 'disabled', 'open', 'scrolled', 'show', 'showing'}
+
+# At-rules whose body is a list of rules that can be pruned individually
+_GROUPING_AT_RULES = {'media', 'supports', 'layer', 'container'}
+
+
+def _protect(text):
+    """Internal function: Replace quoted strings and unquoted url() values with placeholders"""
+    strings = []
+
+    def stash(match):
+        strings.append(match.group(0))
+        return f'\0{len(strings) - 1}\0'
+
+    return _STRING_RE.sub(stash, text), strings
+
+
+def _restore(text, strings):
+    """Internal function: Put quoted strings back in place of their placeholders"""
+    return re.sub(r'\0(\d+)\0', lambda m: strings[int(m.group(1))], text)
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css, strings = _protect(_CSS_COMMENT_RE.sub('', css))
+    css = _WHITESPACE_RE.sub(' ', css)
+    css = _CSS_SPACE_RE.sub(r'\1', css)
+    css = css.replace(': ', ':').replace(';}', '}')
+    return _restore(css.strip(), strings)
+
+
+def _markup_tokens(html):
+    """Internal function: Return the classes, ids and tag names used in an HTML fragment"""
+    classes = {c for value in _CLASS_ATTR_RE.findall(html) for c in value.split()}
+    classes.update(c for args in _SCRIPT_CLASS_RE.findall(html) for c in _SCRIPT_STRING_RE.findall(args))
+    ids = set(_ID_ATTR_RE.findall(html))
+    tags = {tag.lower() for tag in _TAG_RE.findall(html)}
+    return classes | _HOST_CLASSES | _STATE_CLASSES, ids, tags | _HOST_TAGS
+
+
+def _split_top_level(text, sep):
+    """Internal function: Split text on sep, ignoring separators inside parentheses"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _css_blocks(css):
+    """Internal function: Yield (prelude, body) for each top-level block of minified CSS
+
+    Statements without a block, such as @import, are yielded with body None.
+    """
+    pos = 0
+    while pos < len(css):
+        brace = css.find('{', pos)
+        semi = css.find(';', pos)
+        if brace == -1:
+            if css[pos:].strip():
+                yield css[pos:].strip(), None
+            return
+        if semi != -1 and semi < brace:
+            yield css[pos:semi + 1], None
+            pos = semi + 1
+            continue
+        depth = 0
+        for end in range(brace, len(css)):
+            if css[end] == '{':
+                depth += 1
+            elif css[end] == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+        yield css[pos:brace], css[brace + 1:end]
+        pos = end + 1
+
+
+def _selector_may_match(selector, tokens):
+    """Internal function: Return False only if the selector cannot match the markup"""
+    classes, ids, tags = tokens
+    if '\\' in selector:
+        # Escaped characters (e.g. .md\:flex) are not parsed; keep the rule
+        return True
+    selector = _SELECTOR_IGNORE_RE.sub('', selector)
+    return (
+        all(c in classes for c in _SELECTOR_CLASS_RE.findall(selector))
+        and all(i in ids for i in _SELECTOR_ID_RE.findall(selector))
+        and all(t.lower() in tags for t in _SELECTOR_TAG_RE.findall(selector))
+    )
+
+
+def _prune_css(css, tokens):
+    """Internal function: Drop rules of minified, string-protected CSS whose selectors cannot match"""
+    out = []
+    for prelude, body in _css_blocks(css):
+        if body is None:
+            out.append(prelude)
+        elif prelude.startswith('@'):
+            name = re.match(r'@([\w-]+)', prelude).group(1).lower()
+            if name in _GROUPING_AT_RULES:
+                inner = _prune_css(body, tokens)
+                if inner:
+                    out.append(f'{prelude}{{{inner}}}')
+            else:
+                out.append(f'{prelude}{{{body}}}')
+        else:
+            selectors = [s for s in _split_top_level(prelude, ',') if _selector_may_match(s, tokens)]
+            if selectors:
+                out.append(f'{",".join(selectors)}{{{body}}}')
+    return ''.join(out)
+
+
+def prune_css(css, html):
+    """Remove CSS rules whose selectors never match the given markup
+
+    Matching is conservative: pseudo-classes and attribute selectors are
+    ignored, classes toggled by inline classList calls and common state
+    classes such as .active count as present, and elements of the
+    surrounding Streamlit page are always kept.
+    """
+    css, strings = _protect(minify_css(css))
+    return _restore(_prune_css(css, _markup_tokens(html)), strings)
+
+
+def optimize_page(html, prune=True):
+    """Minify an assembled page and drop unused CSS rules from its <style> blocks
+
+    Pass prune=False for part of a page, whose CSS may style markup sent
+    separately. Returns the optimized HTML and a dict with the byte counts
+    before and after.
+    """
+    pruned = html
+    if prune:
+        markup = _STYLE_RE.sub('', html)
+
+        def prune_block(match):
+            css = prune_css(match.group(2), markup)
+            return match.group(1) + css + match.group(3) if css else ''
+
+        pruned = _STYLE_RE.sub(prune_block, html)
+
+    optimized = minify_html(pruned)
+    return optimized, {
+        'before': len(html.encode('utf-8')),
+        'after': len(optimized.encode('utf-8')),
+    }
+
+
+def extract_styles(html):
+    """Remove the <style> blocks from an HTML fragment
+
+    Returns the remaining HTML and the concatenated CSS of the removed
+    blocks. @charset and @import statements are moved to the top, since
+    browsers ignore them after the first rule.
+    """
+    head, blocks = [], []
+    for match in _STYLE_RE.finditer(html):
+        css, strings = _protect(_CSS_COMMENT_RE.sub('', match.group(2)))
+
+        def hoist(statement):
+            head.append((statement.group(1).lower(), _restore(statement.group(0).strip(), strings)))
+            return ''
+
+        blocks.append(_restore(_CSS_HEAD_RE.sub(hoist, css), strings))
+    # A stylesheet has at most one @charset, and it comes first
+    charsets = [statement for kind, statement in head if kind == 'charset'][:1]
+    imports = [statement for kind, statement in head if kind == 'import']
+    return _STYLE_RE.sub('', html), '\n'.join(charsets + imports + blocks)
+
+
+def minify_html(html):
+    """Strip comments and redundant whitespace from an HTML fragment, including inline <style> blocks"""
+    styles = []
+
+    def stash_style(match):
+        styles.append(match.group(1) + minify_css(match.group(2)) + match.group(3))
+        return f'\0s{len(styles) - 1}\0'
+
+    html = _STYLE_RE.sub(stash_style, _HTML_COMMENT_RE.sub('', html))
+    html = _WHITESPACE_RE.sub(' ', html)
+    html = _BLOCK_SPACE_RE.sub(r'\1', html)
+    html = re.sub(r'\0s(\d+)\0', lambda m: styles[int(m.group(1))], html)
+    return html.strip()
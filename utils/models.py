@@ -0,0 +1,331 @@
+"""Typed models of the YAML configuration files
+
+Each config is validated once, when ConfigStore parses the file, and shared
+as a tree of frozen dataclasses: equal configs compare and hash equal, and
+a malformed file is rejected with the path of the offending key instead of
+failing half way through a render. Blank values (`subtitle:`) take the
+field's default, and keys the models do not know are logged and ignored.
+"""
+import dataclasses
+import logging
+import typing
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Tuple, Union
+
+
+class ConfigError(ValueError):
+    """A configuration file does not match its model"""
+
+
+# Image and column sizes are written quoted ('20') by hand and as numbers by the editor
+Size = Union[str, int]
+
+
+# {YAML key: field} of each model class, built on first use
+_key_maps = {}
+
+_logger = logging.getLogger(__name__)
+
+
+def _key(model_field):
+    """Internal function: Return the YAML key of a field (fields named after keywords end with '_')"""
+    return model_field.metadata.get('key', model_field.name)
+
+
+class Model:
+    """Base class of the config models
+
+    Fields can also be read by their YAML key, e.g. button['class'], which
+    is how Jinja looks up keys that are not valid attribute names. keys()
+    lets a model be unpacked into a template context with **.
+    """
+
+    @classmethod
+    def _keys(cls):
+        """Internal function: Return {YAML key: field} of the model, built once per class"""
+        keys = _key_maps.get(cls)
+        if keys is None:
+            keys = _key_maps[cls] = {_key(f): f for f in dataclasses.fields(cls)}
+        return keys
+
+    def keys(self):
+        return self._keys().keys()
+
+    def __getitem__(self, key):
+        model_field = self._keys().get(key)
+        if model_field is None:
+            raise KeyError(key)
+        return getattr(self, model_field.name)
+
+    def __contains__(self, key):
+        return key in self._keys()
+
+    def to_dict(self):
+        """Return the model as plain dicts and lists keyed like the YAML file"""
+        return {key: _to_plain(getattr(self, f.name)) for key, f in self._keys().items()}
+
+    @classmethod
+    def from_dict(cls, data, path=''):
+        """Build and validate a model from parsed YAML
+
+        Parameters:
+            data: Mapping parsed from the config file
+            path: Location of data in the file, used in error messages
+        """
+        if not isinstance(data, Mapping):
+            raise ConfigError(f'{path or "<root>"}: expected a mapping, got {type(data).__name__}')
+        fields = cls._keys()
+        for key in data:
+            if key not in fields:
+                # Not an error: settings for other pages may share the file
+                _logger.warning('%s: unknown key %r ignored', path or '<root>', key)
+
+        hints = typing.get_type_hints(cls)
+        values = {}
+        for key, model_field in fields.items():
+            key_path = f'{path}.{key}' if path else key
+            # A key left blank in YAML is None and means "use the default"
+            if data.get(key) is not None:
+                values[model_field.name] = _convert(data[key], hints[model_field.name], key_path)
+            elif model_field.default is dataclasses.MISSING and model_field.default_factory is dataclasses.MISSING:
+                raise ConfigError(f'{key_path}: missing')
+        return cls(**values)
+
+
+def _to_plain(value):
+    """Internal function: Convert a field value back to YAML-style data"""
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+def _convert(value, hint, path):
+    """Internal function: Check a parsed value against a field type, building nested models"""
+    origin = typing.get_origin(hint)
+    if origin is Union:
+        options = typing.get_args(hint)
+        for option in options:
+            if _matches(value, option):
+                return _convert(value, option, path)
+        names = ' or '.join(getattr(option, '__name__', str(option)) for option in options)
+        raise ConfigError(f'{path}: expected {names}, got {type(value).__name__}')
+    if origin is tuple:
+        if not isinstance(value, (list, tuple)):
+            raise ConfigError(f'{path}: expected a list, got {type(value).__name__}')
+        item_hint = typing.get_args(hint)[0]
+        return tuple(_convert(item, item_hint, f'{path}[{i}]') for i, item in enumerate(value))
+    if isinstance(hint, type) and issubclass(hint, Model):
+        return hint.from_dict(value, path)
+    if hint is str and isinstance(value, (int, float)):
+        # Unquoted YAML such as `price: 0` or `answer: Yes`; printed as the template always printed it
+        return str(value)
+    if not _matches(value, hint):
+        raise ConfigError(f'{path}: expected {hint.__name__}, got {type(value).__name__}')
+    return value
+
+
+def _matches(value, hint):
+    """Internal function: Return whether a scalar has the type of a field (bools are not ints)"""
+    if isinstance(hint, type) and issubclass(hint, Model):
+        return isinstance(value, Mapping)
+    if hint is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, hint)
+
+
+# Frozen dataclasses: immutable and hashable by value
+_model = dataclass(frozen=True)
+
+
+# Shared pieces
+
+@_model
+class Button(Model):
+    link: str
+    text: str
+    icon: str = ''
+    class_: str = field(default='', metadata={'key': 'class'})
+
+
+@_model
+class Image(Model):
+    src: str
+    alt: str = ''
+    width: Size = ''
+    height: Size = ''
+
+
+# landing.yaml
+
+@_model
+class Logo(Model):
+    link: str
+    image_path: str
+    alt_text: str = ''
+    height: Size = ''
+
+
+@_model
+class ToggleButton(Model):
+    title: str
+
+
+@_model
+class MenuItem(Model):
+    link: str
+    text: str
+
+
+@_model
+class Navbar(Model):
+    logo: Logo
+    toggle_button: ToggleButton
+    cta_button: Button
+    left_menu_items: Tuple[MenuItem, ...] = ()
+
+
+@_model
+class Video(Model):
+    source: str
+    type: str = 'video/mp4'
+
+
+@_model
+class Hero(Model):
+    section_id: str
+    video: Video
+    heading: str
+    cta_button: Button
+    subtitle: str = ''
+
+
+@_model
+class FeatureItem(Model):
+    title: str
+    description: str
+    column_width: Size = '4'
+    icon_url: str = ''
+    icon_alt: str = ''
+
+
+@_model
+class Feature(Model):
+    section_id: str
+    title: str
+    subtitle: str = ''
+    list_item: Tuple[FeatureItem, ...] = ()
+
+
+@_model
+class Benefit(Model):
+    title: str
+    description: str
+    icon_class: str = ''
+
+
+@_model
+class Demo(Model):
+    section_id: str
+    heading: str
+    image: Image
+    main_title: str
+    benefits: Tuple[Benefit, ...] = ()
+    cta_buttons: Tuple[Button, ...] = ()
+
+
+@_model
+class Plan(Model):
+    name: str
+    price: str
+    button: Button
+    is_popular: bool = False
+    price_period: str = ''
+    ai_quota: str = ''
+    features: Tuple[str, ...] = ()
+    popular_badge_text: str = ''
+    popular_badge_class: str = ''
+
+
+@_model
+class Pricing(Model):
+    section_id: str
+    title: str
+    feature_icon: str = ''
+    plans: Tuple[Plan, ...] = ()
+
+
+@_model
+class FaqItem(Model):
+    question: str
+    answer: str
+
+
+@_model
+class Faq(Model):
+    title: str
+    faq_items: Tuple[FaqItem, ...] = ()
+
+
+@_model
+class Landing(Model):
+    navbar: Navbar
+    hero: Hero
+    feature: Feature
+    demo: Demo
+    pricing: Pricing
+    faq: Faq
+
+
+@_model
+class LandingConfig(Model):
+    landing: Landing
+
+
+# auth.yaml
+
+@_model
+class SocialLink(Model):
+    name: str
+    url: str
+    icon: str
+
+
+@_model
+class FooterLogo(Model):
+    src: str
+    alt: str = ''
+
+
+@_model
+class Footer(Model):
+    logo: FooterLogo
+    social_links: Tuple[SocialLink, ...] = ()
+
+
+@_model
+class AuthConfig(Model):
+    footer: Footer
+
+
+# Model of each configuration file; files not listed here are not validated
+_CONFIG_MODELS = {
+    'landing': LandingConfig,
+    'auth': AuthConfig,
+}
+
+
+def load_model(name, data):
+    """Validate parsed YAML of the named config; return its model, or None if it has none
+
+    Raises ConfigError naming the file and key when the data is malformed.
+    """
+    model = _CONFIG_MODELS.get(name)
+    if model is None:
+        return None
+    try:
+        return model.from_dict(data)
+    except ConfigError as e:
+        raise ConfigError(f'{name}.yaml: {e}') from None
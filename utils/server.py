@@ -0,0 +1,270 @@
+"""Serve the landing page as a plain, cacheable HTTP response
+
+Usage:
+    python -m utils.server [--host 127.0.0.1] [--port 8080] [--streamlit-url http://localhost:8501]
+
+The page built by helpers.load_page() is sent as a standalone HTML
+document with a strong ETag, Cache-Control and 304 Not Modified handling,
+gzip-compressed for clients that accept it. Files under app/static/ are
+served from static/ the same way. Every other path under /app (the CTA
+target) is redirected to the Streamlit server, which must be started
+separately with `streamlit run Home.py`.
+"""
+import argparse
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from utils import helpers, watcher
+from utils.cache import LRUCache
+from utils.tenants import resolve_tenant
+
+# Title and icon of the standalone page (Streamlit's defaults for Home.py)
+_PAGE_TITLE = 'Home'
+_PAGE_ICON = 'app/static/logo.png'
+
+# The page is revalidated on every visit, which costs a 304 once it is cached
+_PAGE_CACHE_CONTROL = 'public, no-cache'
+
+# Static files; names with a 12-digit content hash (styles.<hash>.css, vendored assets) never change
+_STATIC_CACHE_CONTROL = 'public, max-age=3600'
+_IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+_HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+
+# Single byte range of a Range header, e.g. bytes=0-1023 or bytes=1024-
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Responses smaller than this are sent uncompressed
+_GZIP_MIN_SIZE = 1024
+
+# Encoded page bodies, keyed by a hash of the payload, and static file bodies, versioned by mtime
+_page_bodies = LRUCache(16)
+_static_bodies = LRUCache(64)
+
+# Static files larger than this are read from disk on each request instead of cached
+_MAX_CACHED_FILE_SIZE = 4 * 2**20
+
+_logger = logging.getLogger(__name__)
+
+
+def _entity(body, content_type, compress):
+    """Internal function: Return (identity, gzip or None) representations of a body, each as (bytes, ETag)"""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    identity = (body, f'"{digest}"')
+    compressed = None
+    if compress and len(body) >= _GZIP_MIN_SIZE:
+        # mtime=0 keeps the compressed bytes, and so their ETag, reproducible
+        compressed = (gzip.compress(body, mtime=0), f'"{digest}-gz"')
+    return {'identity': identity, 'gzip': compressed, 'type': content_type}
+
+
+def _document(payload):
+    """Internal function: Wrap the page payload in a standalone HTML document"""
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{_PAGE_TITLE}</title>\n<link rel="icon" href="{_PAGE_ICON}">\n'
+        f'</head>\n<body>\n{payload}\n</body>\n</html>\n'
+    )
+
+
+def page_entity(tenant=None):
+    """Return the landing page as a cacheable entity, building it from the shared caches"""
+    payload = helpers.load_page(tenant)
+    key = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    entity = _page_bodies.get(key)
+    if entity is None:
+        entity = _entity(_document(payload).encode('utf-8'), 'text/html; charset=utf-8', compress=True)
+        _page_bodies.put(key, entity)
+    return entity
+
+
+def _static_path(url_path):
+    """Internal function: Return the file below the static directory a URL path points to, or None"""
+    root = os.path.realpath(helpers._STATIC_DIR)
+    path = os.path.realpath(os.path.join(root, url_path))
+    if os.path.commonpath([root, path]) != root or not os.path.isfile(path):
+        return None
+    return path
+
+
+def static_entity(path):
+    """Return a static file as a cacheable entity, or None if it is too large to keep in memory"""
+    st = os.stat(path)
+    if st.st_size > _MAX_CACHED_FILE_SIZE:
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    entity = _static_bodies.get(path, version=version)
+    if entity is None:
+        with open(path, 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        # Images, video and fonts are compressed already
+        compress = content_type.startswith('text/') or content_type in ('application/json', 'image/svg+xml')
+        entity = _entity(body, content_type, compress)
+        _static_bodies.put(path, entity, version=version)
+    return entity
+
+
+def _etag_matches(header, etag):
+    """Internal function: Return whether an If-None-Match header matches an ETag (weak comparison)"""
+    if header.strip() == '*':
+        return True
+    return etag in (tag.strip().removeprefix('W/') for tag in header.split(','))
+
+
+class LandingHandler(BaseHTTPRequestHandler):
+    """Request handler serving the landing page and static files, and sending /app to Streamlit"""
+
+    server_version = 'LandingServer'
+    # Set by main(): base URL of the Streamlit server
+    streamlit_url = 'http://localhost:8501'
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head=False):
+        url = urlsplit(self.path)
+        if url.path in ('/', '/index.html'):
+            tenant = resolve_tenant(dict(parse_qsl(url.query)), self.headers)
+            self._send_entity(page_entity(tenant), _PAGE_CACHE_CONTROL, head)
+        elif url.path.startswith('/app/static/'):
+            path = _static_path(url.path[len('/app/static/'):])
+            if path is None:
+                self.send_error(HTTPStatus.NOT_FOUND)
+                return
+            entity = static_entity(path)
+            if entity is None or 'Range' in self.headers:
+                # Media players ask for byte ranges, which only the file path serves
+                self._send_file(path, head, entity['identity'][1] if entity else None)
+                return
+            cache_control = _IMMUTABLE_CACHE_CONTROL if _HASHED_NAME_RE.search(path) else _STATIC_CACHE_CONTROL
+            self._send_entity(entity, cache_control, head)
+        elif url.path == '/app' or url.path.startswith('/app/'):
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header('Location', f'{self.streamlit_url.rstrip("/")}{self.path}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_error(HTTPStatus.NOT_FOUND)
+
+    def _send_entity(self, entity, cache_control, head):
+        """Internal function: Send an entity, or 304 if the client's copy is current"""
+        accepts_gzip = 'gzip' in self.headers.get('Accept-Encoding', '')
+        encoding = 'gzip' if accepts_gzip and entity['gzip'] else 'identity'
+        body, etag = entity[encoding]
+
+        if _etag_matches(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag, cache_control, entity)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self._send_cache_headers(etag, cache_control, entity)
+        self.send_header('Content-Type', entity['type'])
+        if encoding == 'gzip':
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _send_cache_headers(self, etag, cache_control, entity):
+        """Internal function: Send the validator and caching headers shared by 200 and 304"""
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control)
+        if entity['gzip']:
+            self.send_header('Vary', 'Accept-Encoding')
+
+    def _send_file(self, path, head, etag=None):
+        """Internal function: Stream a static file (e.g. the hero video) from disk, honouring a single byte range
+
+        Files too large to cache are validated by their mtime and size instead of a content hash.
+        """
+        st = os.stat(path)
+        etag = etag or f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        if _etag_matches(self.headers.get('If-None-Match', ''), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start, end = 0, st.st_size - 1
+        match = _RANGE_RE.match(self.headers.get('Range', ''))
+        if match and any(match.groups()):
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), end) if match.group(2) else end
+            else:
+                # bytes=-N is the last N bytes
+                start = max(st.st_size - int(match.group(2)), 0)
+            if start > end:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{st.st_size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{st.st_size}')
+        else:
+            self.send_response(HTTPStatus.OK)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', _STATIC_CACHE_CONTROL)
+        self.send_header('Last-Modified', formatdate(st.st_mtime, usegmt=True))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Type', mimetypes.guess_type(path)[0] or 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start + 1))
+        self.end_headers()
+        if not head:
+            with open(path, 'rb') as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = f.read(min(64 * 1024, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+    def log_message(self, format, *args):
+        _logger.info('%s - %s', self.address_string(), format % args)
+
+
+def serve(host='127.0.0.1', port=8080, streamlit_url='http://localhost:8501'):
+    """Serve the landing page until interrupted"""
+    LandingHandler.streamlit_url = streamlit_url
+    # Keeps the caches current, so serving a cached page touches no files
+    watcher.start()
+    helpers.warm_up()
+    server = ThreadingHTTPServer((host, port), LandingHandler)
+    print(f'Serving the landing page on http://{host}:{port}/ (/app -> {streamlit_url})')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the landing page over plain HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8080, help='port to listen on')
+    parser.add_argument('--streamlit-url', default='http://localhost:8501',
+                        help='base URL of the Streamlit server that /app is redirected to')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.streamlit_url)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import os
+import re
+
+from utils.cache import LRUCache
+from utils.config_store import ConfigStore, config_store
+
+# Directory holding one subdirectory per tenant, named after the tenant or its host name:
+#   template/tenants/<name>/config/*.yaml              configs of the tenant
+#   template/tenants/<name>/template_version/...       optional template overrides
+_TENANTS_DIR = 'template/tenants'
+
+# Tenant directories relative to the template root, as seen by the Jinja loader
+_TEMPLATE_ROOT = 'tenants'
+
+# Query parameter that selects a tenant explicitly, e.g. /?site=acme
+_QUERY_PARAM = 'site'
+
+# Maximum number of tenants kept in memory, and of rendered pages kept per tenant
+_MAX_TENANTS = 32
+_TENANT_RENDER_CACHE_SIZE = 8
+
+# Tenant names are directory names; this also rules out path traversal
+_NAME_RE = re.compile(r'^[a-z0-9][a-z0-9.-]*$')
+
+
+class Tenant:
+    """Configs, template overrides and rendered pages of one site served by this process
+
+    Config files missing from the tenant directory fall back to the shared
+    ones in template/config/, and templates without an override use the
+    shared compiled template.
+    """
+
+    __slots__ = ('name', 'store', 'render_cache', 'overrides')
+
+    def __init__(self, name):
+        self.name = name
+        self.store = ConfigStore(os.path.join(_TENANTS_DIR, name, 'config'))
+        self.render_cache = LRUCache(_TENANT_RENDER_CACHE_SIZE)
+        # Scanned once; a tenant picks up new override files when it is reloaded
+        root = os.path.join(_TENANTS_DIR, name)
+        self.overrides = {
+            os.path.relpath(os.path.join(path, file_name), root).replace(os.sep, '/')
+            for path, _, file_names in os.walk(root)
+            for file_name in file_names if file_name.endswith('.html')
+        }
+
+    def load(self, name):
+        """Return (typed model, content hash) of a config, preferring the tenant's own file"""
+        model, digest = self.store.load(name)
+        if model is None:
+            return config_store.load(name)
+        return model, digest
+
+    def template_name(self, name):
+        """Return the loader name of a template, e.g. 'template_version/landing.html', for this tenant"""
+        if name in self.overrides:
+            return f'{_TEMPLATE_ROOT}/{self.name}/{name}'
+        return name
+
+
+# Loaded tenants, least recently used first
+_tenants = LRUCache(_MAX_TENANTS)
+
+
+def get_tenant(name):
+    """Return the tenant with the given name, or None if it has no directory"""
+    name = name.lower()
+    tenant = _tenants.get(name)
+    if tenant is None:
+        if not _NAME_RE.match(name) or not os.path.isdir(os.path.join(_TENANTS_DIR, name)):
+            return None
+        tenant = Tenant(name)
+        _tenants.put(name, tenant)
+    return tenant
+
+
+def resolve_tenant(query_params=None, headers=None):
+    """Return the tenant of a request, or None for the default site
+
+    Parameters:
+        query_params: Query parameters of the request; ?site=<name> selects a tenant
+        headers: Request headers; a tenant directory named after the Host header matches too
+    """
+    candidates = []
+    if query_params:
+        candidates.append(query_params.get(_QUERY_PARAM))
+    if headers:
+        candidates.append((headers.get('Host') or '').split(':')[0])
+    for name in candidates:
+        if name:
+            tenant = get_tenant(name)
+            if tenant is not None:
+                return tenant
+    return None
+
+
+def tenant_stats():
+    """Return hit/miss counters of the tenant registry"""
+    return _tenants.stats()
+
+
+def clear_tenants():
+    """Forget every loaded tenant with its configs and rendered pages"""
+    _tenants.clear()
@@ -0,0 +1,263 @@
+"""Background watcher that keeps the page caches in sync with the files on disk
+
+One thread per process watches the directories returned by
+helpers.watched_dirs(), with inotify on Linux and by polling elsewhere. It
+pushes each change into the caches, so renders no longer stat() the files,
+and reruns the Streamlit sessions whose page is no longer current.
+"""
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from utils import helpers
+
+# Seconds between directory scans when inotify is unavailable
+_POLL_INTERVAL = 1.0
+
+# Seconds to wait for more events after the first, so one save is handled as one change
+_SETTLE_DELAY = 0.05
+
+# inotify(7) constants
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct('iIII')
+
+_logger = logging.getLogger(__name__)
+
+
+def _walk_files(dirs):
+    """Internal function: Yield the path of every file below dirs"""
+    for root in dirs:
+        for path, _, file_names in os.walk(root):
+            for file_name in file_names:
+                yield os.path.join(path, file_name)
+
+
+class _InotifyBackend:
+    """Change source built on Linux inotify, watching every directory below the roots"""
+
+    def __init__(self, dirs):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = dirs
+        self._paths = {}
+        for root in dirs:
+            self._watch_tree(root)
+
+    def _watch_tree(self, root):
+        """Internal function: Watch a directory and its subdirectories"""
+        for path, _, _ in os.walk(root):
+            wd = self._add_watch(self.fd, os.fsencode(path), _IN_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+            self._paths[wd] = path
+
+    def wait(self, timeout):
+        """Return the paths changed since the last call, waiting up to timeout seconds for one"""
+        changed = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return changed
+        time.sleep(_SETTLE_DELAY)
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\0')
+                offset += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    # Events were dropped; treat every file as changed
+                    changed.update(_walk_files(self.dirs))
+                    continue
+                if mask & _IN_IGNORED:
+                    self._paths.pop(wd, None)
+                    continue
+                directory = self._paths.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name))
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._watch_tree(path)
+                        changed.update(_walk_files([path]))
+                    continue
+                changed.add(path)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollingBackend:
+    """Change source that compares stat() results of every file below the roots"""
+
+    def __init__(self, dirs):
+        self.dirs = dirs
+        self._signatures = self._scan()
+
+    def _scan(self):
+        """Internal function: Return {path: (mtime, size, inode)} of every file below the roots"""
+        signatures = {}
+        for path in _walk_files(self.dirs):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signatures[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+        return signatures
+
+    def wait(self, timeout):
+        """Return the paths changed since the last call, scanning again after timeout seconds"""
+        time.sleep(timeout)
+        signatures = self._scan()
+        old = self._signatures
+        self._signatures = signatures
+        return {path for path in old.keys() | signatures.keys() if old.get(path) != signatures.get(path)}
+
+    def close(self):
+        pass
+
+
+class Watcher(threading.Thread):
+    """Daemon thread feeding file changes into the caches and rerunning stale sessions"""
+
+    def __init__(self, dirs):
+        super().__init__(name='template-watcher', daemon=True)
+        self.dirs = [path for path in dirs if os.path.isdir(path)]
+        try:
+            self.backend = _InotifyBackend(self.dirs)
+        except (OSError, AttributeError) as e:
+            # No inotify (not Linux, or out of watches): fall back to scanning
+            _logger.info('inotify unavailable (%s); polling every %.1fs', e, _POLL_INTERVAL)
+            self.backend = _PollingBackend(self.dirs)
+        self.changes = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        # Renders stop checking the disk only once changes are being delivered
+        helpers.watch_files(self.dirs)
+        try:
+            while not self._stop_event.is_set():
+                changed = self.backend.wait(_POLL_INTERVAL)
+                if changed:
+                    self._apply(changed)
+        finally:
+            helpers.watch_files([])
+            self.backend.close()
+
+    def _apply(self, paths):
+        """Internal function: Invalidate the caches built from paths and rerun the affected sessions"""
+        _logger.info('Files changed: %s', ', '.join(sorted(paths)))
+        for path in paths:
+            helpers.file_changed(path)
+        self.changes += len(paths)
+        try:
+            _rerun_stale_sessions()
+        except Exception:
+            _logger.exception('Could not rerun sessions after a file change')
+
+    def stop(self):
+        """Ask the thread to exit after its current wait"""
+        self._stop_event.set()
+
+
+# Last page sent to each Streamlit session: {session id: (tenant, page hash)}
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# The process-wide watcher, started by start()
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def start():
+    """Start the process-wide watcher if it is not running yet; return it"""
+    global _watcher
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                watcher = Watcher(helpers.watched_dirs())
+                watcher.start()
+                _watcher = watcher
+    return _watcher
+
+
+def _page_digest(page):
+    """Internal function: Return the hash used to tell whether a session's page changed"""
+    return hashlib.sha256(page.encode('utf-8')).hexdigest()
+
+
+def track_session(page, tenant=None):
+    """Remember the page the running Streamlit session shows, to rerun it only when that page changes
+
+    Parameters:
+        page: Payload sent to the session, i.e. the joined helpers.load_page_chunks()
+        tenant: Tenant the page was rendered for (None for the default site)
+    """
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return
+    with _sessions_lock:
+        _sessions[ctx.session_id] = (tenant, _page_digest(page))
+
+
+def _rerun_stale_sessions():
+    """Internal function: Rebuild each tracked page and rerun the sessions whose page differs"""
+    from streamlit.runtime import Runtime
+    if not Runtime.exists():
+        return
+    # Streamlit has no public API to rerun another session
+    session_manager = Runtime.instance()._session_mgr
+
+    with _sessions_lock:
+        sessions = dict(_sessions)
+    pages = {}
+    for session_id, (tenant, digest) in sessions.items():
+        info = session_manager.get_active_session_info(session_id)
+        if info is None:
+            with _sessions_lock:
+                _sessions.pop(session_id, None)
+            continue
+        if tenant not in pages:
+            # Built here, so the rerun itself is served from the caches
+            try:
+                pages[tenant] = _page_digest(''.join(helpers.load_page_chunks(tenant)))
+            except Exception:
+                # E.g. a config saved half way through an edit; sessions keep the last good page
+                _logger.exception('Could not rebuild the page after a file change')
+                pages[tenant] = None
+        if pages[tenant] not in (None, digest):
+            # The previous client state keeps the session's query string, e.g. ?site=
+            info.session.request_rerun(getattr(info.session, '_client_state', None))
+
+
+def watcher_stats():
+    """Return the watcher backend, the number of file changes handled and the tracked sessions"""
+    return {
+        'backend': None if _watcher is None else type(_watcher.backend).__name__.strip('_'),
+        'changes': 0 if _watcher is None else _watcher.changes,
+        'sessions': len(_sessions),
+    }